@@ -1,11 +1,23 @@
 import os
 import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 import pandas as pd
 
 from datetime import datetime
 
 import ingestion_db_pipeline
+from persistence.database import create_database, analyze_database
+
+
+def _prepare_file(csv_file_path: str, group_name: str):
+    """Worker: read, validate, clean and summarise one daily file (no database access)."""
+    target_date = pd.Timestamp(os.path.basename(csv_file_path).split('.')[0]).date()
+    return target_date, ingestion_db_pipeline.prepare_data(csv_file_path=csv_file_path,
+                                                           target_date=target_date,
+                                                           group_name=group_name)
+
 
 if __name__ == "__main__":
     """Parse command line arguments."""
@@ -23,6 +35,12 @@ if __name__ == "__main__":
         type=int,
         help="number of days to be considered to calculate the historical pattern",
     )
+    parser.add_argument(
+        "--workers",
+        default=os.cpu_count(),
+        type=int,
+        help="number of worker processes used to read and clean the csv files",
+    )
 
     args = parser.parse_args()
 
@@ -31,11 +49,25 @@ if __name__ == "__main__":
     csv_files = [f for f in os.listdir(args.csv_folder) if f.endswith('.csv')]
     csv_files.sort(key=lambda x: datetime.strptime(x, '%Y-%m-%d.csv'))
 
-    for csv_file in csv_files:
-        # Create the full file path
-        file_path = os.path.join(args.csv_folder, csv_file)
-        target_date = pd.Timestamp(csv_file.split('.')[0]).date()
-        ingestion_db_pipeline.run_pipeline(csv_file_path=file_path,
-                                           target_date=target_date,
-                                           group_name=folder_name,
-                                           window_days=args.window_days)
+    file_paths = [os.path.join(args.csv_folder, csv_file) for csv_file in csv_files]
+
+    # Ensure tables exist (no-op if already created)
+    create_database()
+
+    # Files are independent, so reading and cleaning runs in parallel. Database writes and
+    # anomaly detection stay serial and in date order, since each day compares against the
+    # history stored by the previous days.
+    # "spawn" so workers never inherit thread pools started in this process (e.g. by numba)
+    with ProcessPoolExecutor(max_workers=args.workers,
+                             mp_context=multiprocessing.get_context("spawn")) as executor:
+        for target_date, prepared in executor.map(_prepare_file, file_paths,
+                                                  [folder_name] * len(file_paths)):
+            if prepared is None:
+                continue
+            df, summary_df = prepared
+            ingestion_db_pipeline.store_and_detect(df, summary_df,
+                                                   target_date=target_date,
+                                                   window_days=args.window_days)
+
+    # Once per batch, after all the writes
+    analyze_database()
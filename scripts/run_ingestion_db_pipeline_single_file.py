@@ -4,6 +4,7 @@ import argparse
 import pandas as pd
 
 import ingestion_db_pipeline
+from persistence.database import analyze_database
 
 if __name__ == "__main__":
     """Parse command line arguments."""
@@ -47,3 +48,6 @@ if __name__ == "__main__":
                                        target_date=target_date,
                                        group_name=group_name,
                                        window_days=args.window_days)
+
+    # Once per batch, after all the writes
+    analyze_database()
@@ -5,6 +5,8 @@ import pandas as pd
 
 from sqlalchemy.orm import Session
 
+from ingestion.utils import to_float64
+
 from persistence.crud import load_historical_daily_avg_stats, load_historical_daily_totals_stats
 
 
@@ -17,9 +19,13 @@ def detect_daily_output_sum_anomalies(
     Flags if today's total_power_output is outside ±sigma_threshold·std.
     """
     # Aggregate today's data to get total power output per turbine for the target date
-    today_df["date"] = today_df["timestamp"].dt.date  # Extract the date part
-    today_aggregated = today_df.groupby(["turbine_id", "date"])["power_output"].sum().reset_index()
-    today_aggregated = today_aggregated.rename(columns={"power_output": "total_power_output"})
+    today_df["date"] = today_df["timestamp"].values.astype("datetime64[D]")  # Extract the date part
+    today_aggregated = (
+        to_float64(today_df["power_output"])
+        .groupby([today_df["turbine_id"], today_df["date"]]).sum()
+        .reset_index()
+        .rename(columns={"power_output": "total_power_output"})
+    )
 
     # Load historical mean/std using the helper
     hist_stats = load_historical_daily_totals_stats(
@@ -31,17 +37,14 @@ def detect_daily_output_sum_anomalies(
     # Merge today's summary with historical stats
     merged = today_aggregated.merge(hist_stats, on="turbine_id", how="left")
 
-    # Flag anomalies
-    def _flag(row):
-        return (
-            row.total_power_output > row.hist_mean_daily_output + sigma_threshold * row.hist_std_daily_output or
-            row.total_power_output < row.hist_mean_daily_output - sigma_threshold * row.hist_std_daily_output
-        )
-
-    merged["is_anomaly"] = merged.apply(_flag, axis=1)
+    # Flag anomalies (vectorized over the underlying arrays)
+    total = merged["total_power_output"].to_numpy()
+    mean = merged["hist_mean_daily_output"].to_numpy(dtype=float)
+    delta = sigma_threshold * merged["hist_std_daily_output"].to_numpy(dtype=float)
+    merged["is_anomaly"] = (total > mean + delta) | (total < mean - delta)
 
     merged = merged.reset_index(drop=True).rename(columns={'timestamp': 'date'})
 
     return merged[
         ["date", "turbine_id", "total_power_output", "hist_mean_daily_output", "hist_std_daily_output", "is_anomaly"]
-    ][merged['is_anomaly']]
\ No newline at end of file
+    ][merged["is_anomaly"].to_numpy()]
\ No newline at end of file
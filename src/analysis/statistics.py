@@ -1,16 +1,22 @@
 import pandas as pd
 
+from ingestion.utils import to_float64
+
 
 def calculate_daily_summary(df: pd.DataFrame) -> pd.DataFrame:
-    """Calculate min, max, mean power output, wind speed, and wind direction per turbine per day."""
+    """Calculate min, max, mean and total power output per turbine per day."""
+    # Group on a native datetime64[D] key rather than Python date objects
+    date_key = df['timestamp'].values.astype('datetime64[D]')
+    power_output = to_float64(df['power_output'])
     summary = (
-        df.groupby([df['timestamp'].dt.date, 'turbine_id'])
+        power_output.groupby([date_key, df['turbine_id']])
         .agg(
-            min_power_output=('power_output', 'min'),
-            max_power_output=('power_output', 'max'),
-            mean_power_output=('power_output', 'mean'),
+            min_power_output='min',
+            max_power_output='max',
+            mean_power_output='mean',
+            total_power_output='sum',
         )
+        .rename_axis(['date', 'turbine_id'])
         .reset_index()
-        .rename(columns={'timestamp': 'date'})
     )
     return summary
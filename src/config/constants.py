@@ -1,3 +1,5 @@
+import os
+
 FORWARD_FILL_LIMIT_MINUTES = 10  # Max allowed gap for forward fill (in minutes)
 REPORT_FREQ = 5  # Assuming data is every 5 minutes
 OUTLIER_STD_THRESHOLD = 3  # z-score for outlier detection
@@ -20,4 +22,17 @@ SENSOR_LIMITS = {
 }
 
 # Define the database URL (SQLite in this case)
-DATABASE_URL = "sqlite:///./wind_turbine_data.db"
\ No newline at end of file
+DATABASE_URL = "sqlite:///./wind_turbine_data.db"
+
+# Connection-level SQLite tuning: WAL + NORMAL sync means fewer fsyncs per commit
+# and readers that do not block the writer
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "mmap_size": 268435456,  # 256 MiB
+    "cache_size": -65536,    # 64 MiB (negative = KiB)
+}
+
+# Run the clean -> daily summary chain with polars instead of pandas (requires the polars package)
+POLARS_BACKEND = os.environ.get("POLARS_BACKEND") == "1"
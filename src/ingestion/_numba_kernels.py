@@ -0,0 +1,89 @@
+"""
+Numba kernels for the cleaning masks: the physical-limits range check and the per-turbine
+standard deviation outlier mask. Importing this module raises ImportError when numba is not
+installed; ingestion.cleaning falls back to its NumPy implementations in that case.
+"""
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True, parallel=True)
+def _mark_out_of_range(values, lo, hi, out):
+    for i in prange(values.shape[0]):
+        v = values[i]
+        # NaN compares False both ways, so missing values are never out of range (same as NumPy)
+        if v < lo or v > hi:
+            out[i] = True
+
+
+def mark_out_of_range(values: np.ndarray, lo: float, hi: float, out: np.ndarray) -> None:
+    """
+    Set `out` to True for every value outside [lo, hi], in one pass with no temporaries.
+    The bounds are cast to the column's dtype first, so float32 columns compare like NumPy does.
+    """
+    values = np.ascontiguousarray(values)
+    bound = values.dtype.type if np.issubdtype(values.dtype, np.floating) else np.float64
+    _mark_out_of_range(values, bound(lo), bound(hi), out)
+
+
+@njit(cache=True, parallel=True)
+def _outlier_mask_sorted(vals, starts, ends, thr):
+    mask = np.zeros(vals.shape[0], dtype=np.bool_)
+    for g in prange(starts.shape[0]):
+        lo_i, hi_i = starts[g], ends[g]
+
+        # First pass: mean over non-missing values
+        total = 0.0
+        n = 0
+        for i in range(lo_i, hi_i):
+            if not np.isnan(vals[i]):
+                total += vals[i]
+                n += 1
+        mean = total / n if n > 0 else np.nan
+
+        # Second pass: sample standard deviation (ddof=1, same as pandas)
+        sq = 0.0
+        for i in range(lo_i, hi_i):
+            if not np.isnan(vals[i]):
+                sq += (vals[i] - mean) ** 2
+        std = np.sqrt(sq / (n - 1)) if n > 1 else np.nan
+
+        lo, hi = mean - thr * std, mean + thr * std
+        for i in range(lo_i, hi_i):
+            # NaN values or bounds are never "within" the range, matching Series.between
+            mask[i] = not (lo <= vals[i] <= hi)
+    return mask
+
+
+def outlier_mask(vals: np.ndarray, turbine_ids: np.ndarray, thr: float) -> np.ndarray:
+    """
+    Return a boolean mask marking values outside mean ± thr·std of their turbine.
+    Input is normally already sorted by turbine_id; otherwise it is sorted here and the
+    mask is scattered back to the original order.
+    """
+    vals = np.ascontiguousarray(vals, dtype=np.float64)
+    turbine_ids = np.asarray(turbine_ids)
+
+    order = None
+    if turbine_ids.size and np.any(turbine_ids[1:] < turbine_ids[:-1]):
+        order = np.argsort(turbine_ids, kind="stable")
+        vals, turbine_ids = vals[order], turbine_ids[order]
+
+    boundaries = np.flatnonzero(turbine_ids[1:] != turbine_ids[:-1]) + 1
+    starts = np.concatenate(([0], boundaries)).astype(np.int64)
+    ends = np.concatenate((boundaries, [turbine_ids.size])).astype(np.int64)
+
+    mask = _outlier_mask_sorted(vals, starts, ends, float(thr))
+    if order is None:
+        return mask
+
+    result = np.empty_like(mask)
+    result[order] = mask
+    return result
+
+
+# Warm the JIT (and its on-disk cache) at import time rather than on the first real file.
+# The range check is compiled per sensor column dtype; outlier_mask always runs on float64
+for _dtype in (np.float32, np.float64):
+    mark_out_of_range(np.zeros(2, dtype=_dtype), 0.0, 1.0, np.zeros(2, dtype=np.bool_))
+outlier_mask(np.zeros(2), np.zeros(2, dtype=np.int64), 3.0)
@@ -1,53 +1,73 @@
 from typing import Dict
+import numpy as np
 import pandas as pd
 
+from ingestion.utils import sort_by_turbine_and_time
 from ingestion.validation import SENSOR_COLUMNS
 from config.constants import FORWARD_FILL_LIMIT_MINUTES, REPORT_FREQ, IQR_FACTOR, SENSOR_LIMITS, OUTLIER_STD_THRESHOLD
 
 import logging
 
+try:
+    from ingestion._numba_kernels import mark_out_of_range, outlier_mask
+except ImportError:
+    # numba not installed, use the pandas/NumPy implementations
+    outlier_mask = None
+    mark_out_of_range = None
+
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
 def remove_duplicates(df: pd.DataFrame) -> pd.DataFrame:
     before = len(df)
-    df = df.drop_duplicates(subset=["timestamp", "turbine_id"])
+    # Once sorted by (turbine_id, timestamp) duplicates are adjacent, so no hash table is needed
+    df = sort_by_turbine_and_time(df)
+    df = df[~_duplicate_mask(df["turbine_id"].to_numpy(), df["timestamp"].to_numpy())]
     after = len(df)
     logger.info(f"Removed {before - after} duplicate rows.")
     return df
 
 
+def _critical_missing(df: pd.DataFrame) -> np.ndarray:
+    """Boolean mask of rows missing a timestamp or turbine_id, read off the NumPy arrays."""
+    timestamps = df["timestamp"]
+    if pd.api.types.is_datetime64_dtype(timestamps):
+        missing = np.isnat(timestamps.to_numpy())
+    else:
+        missing = timestamps.isna().to_numpy()
+    # An integer turbine_id (as validate_dataframe produces) cannot hold missing values
+    if not pd.api.types.is_integer_dtype(df["turbine_id"]):
+        missing |= df["turbine_id"].isna().to_numpy()
+    return missing
+
+
 def handle_missing_values(df: pd.DataFrame) -> pd.DataFrame:
     # Drop rows missing critical columns (timestamp, turbine_id)
-    df = df.dropna(subset=["timestamp", "turbine_id"])
-    df = df.sort_values(["turbine_id", "timestamp"])
+    critical_missing = _critical_missing(df)
+    if critical_missing.any():
+        df = df[~critical_missing]
+    df = sort_by_turbine_and_time(df)  # no-op for frames coming from read_and_validate_csv
 
     # Flag turbines with missing sensor data
-    turbines_with_missing_data = []
-
-    def fill_missing_sensor_data(group: pd.DataFrame) -> pd.DataFrame:
-        group = group.sort_values("timestamp")
-
-        missing_data = group[SENSOR_COLUMNS].isnull().sum(axis=1)
-        if missing_data.any():
-            turbines_with_missing_data.append(group["turbine_id"].iloc[0])
-            logger.warning(f"Missing sensor data for turbine {group['turbine_id'].iloc[0]}")
-
-        # Apply forward-fill for missing sensor data, but limit the number of steps (e.g., no more than 10 minutes gap)
-        for col in SENSOR_COLUMNS:
-            group[col] = group[col].ffill(limit=2)  # 2 step, for example, 10 min if 5T freq
-
-        return group
-
-    # Apply to each turbine group
-    df = df.groupby("turbine_id", group_keys=False).apply(fill_missing_sensor_data)
+    turbines_with_missing_data = df.loc[df[SENSOR_COLUMNS].isnull().any(axis=1), "turbine_id"].unique()
+    for turbine_id in turbines_with_missing_data:
+        logger.warning(f"Missing sensor data for turbine {turbine_id}")
+
+    # Apply forward-fill for missing sensor data within each turbine, but limit the number of steps
+    # (e.g., no more than 10 minutes gap)
+    if len(turbines_with_missing_data):
+        # 2 step, for example, 10 min if 5T freq
+        # assign() builds a new frame: df may still be the caller's object when nothing was dropped
+        group_starts = _group_starts(df["turbine_id"].to_numpy())
+        df = df.assign(**{col: _ffill_within_groups(df[col].to_numpy(), group_starts, limit=2)
+                          for col in SENSOR_COLUMNS})
 
     # Remove rows where sensor values are still missing after filling (drop problematic rows)
     df = df.dropna(subset=SENSOR_COLUMNS)
 
-    if turbines_with_missing_data:
-        logger.error(f"Turbines with missing sensor data: {set(turbines_with_missing_data)}")
+    if len(turbines_with_missing_data):
+        logger.error(f"Turbines with missing sensor data: {set(turbines_with_missing_data.tolist())}")
 
     logger.info(f"Data after missing value handling: {len(df)} rows.")
 
@@ -61,37 +81,49 @@ def clean_physical_limits(df: pd.DataFrame, sensor_limits: dict = SENSOR_LIMITS)
     """
     before_len = len(df)
 
-    def _check_within_limits(col: pd.Series, limits: dict) -> pd.Series:
-        mask = pd.Series(False, index=col.index)
-        if limits.get("min") is not None:
-            mask |= col < limits["min"]
-        if limits.get("max") is not None:
-            mask |= col > limits["max"]
-        return mask
-
-    invalid_masks = []
-    for feature, limits in sensor_limits.items():
+    features = []
+    for feature in sensor_limits:
         if feature not in df.columns:
             logger.warning(f"Skipped {feature}: not in DataFrame")
             continue
+        features.append(feature)
 
-        mask = _check_within_limits(df[feature], limits)
-        if mask.any():
-            n = mask.sum()
-            logger.info(f"Removing {n} rows: {feature} outside [{limits['min']}, {limits['max']}]")
-            invalid_masks.append(mask)
+    # One row of the mask matrix per feature
+    masks = np.zeros((len(features), len(df)), dtype=bool)
+    for i, feature in enumerate(features):
+        limits = sensor_limits[feature]
+        _mark_out_of_range(df[feature].to_numpy(), limits, masks[i])
 
-    if invalid_masks:
-        combined = invalid_masks[0]
-        for m in invalid_masks[1:]:
-            combined |= m
-        df = df.loc[~combined].reset_index(drop=True)
+        n = masks[i].sum()
+        if n:
+            logger.info(f"Removing {n} rows: {feature} outside [{limits.get('min')}, {limits.get('max')}]")
+
+    combined = masks.any(axis=0)
+    if combined.any():
+        df = df.iloc[~combined].reset_index(drop=True)
 
     after_len = len(df)
     logger.info(f"clean_physical_limits: dropped {before_len - after_len} rows, {after_len} remain.")
     return df
 
 
+def _apply_outlier_mask(df: pd.DataFrame, is_out: pd.Series, action: str) -> pd.DataFrame:
+    """Log per-turbine outlier counts, then flag or drop the rows selected by `is_out`."""
+    total_outliers = int(is_out.sum())
+    if total_outliers:
+        for turbine_id, n_out in is_out.groupby(df["turbine_id"]).sum().items():
+            if n_out:
+                logger.info(f"Turbine {turbine_id}: {n_out} outliers detected")
+
+    logger.info(f"Total outliers {action!r}: {total_outliers}")
+
+    if action == "flag":
+        df = df.copy()
+        df["is_outlier"] = is_out
+        return df.reset_index(drop=True)
+    return df.loc[~is_out].reset_index(drop=True)
+
+
 def detect_and_handle_outliers_statistically_std(df: pd.DataFrame,
                                                  feature: str = "power_output",
                                                  action: str = 'drop') -> pd.DataFrame:
@@ -104,42 +136,12 @@ def detect_and_handle_outliers_statistically_std(df: pd.DataFrame,
         raise ValueError(f"action must be one of flag|drop, got {action!r}")
 
     before_len = len(df)
-    total_outliers = 0
-
-    def _process_grp(g):
-        nonlocal total_outliers
-        mean = g[feature].mean()
-        std_dev = g[feature].std()
-
-        # Define the threshold based on standard deviation
-        lo, hi = mean - OUTLIER_STD_THRESHOLD * std_dev, mean + OUTLIER_STD_THRESHOLD * std_dev
-
-        # Flag or filter rows that are outside the range of (lo, hi)
-        is_out = ~g[feature].between(lo, hi)
-
-        n_out = is_out.sum()
-        total_outliers += int(n_out)
-        if n_out:
-            logger.info(f"Turbine {g.name}: {n_out} outliers detected")
-
-        g = g.copy()
-        if action == "flag":
-            g["is_outlier"] = is_out
-            return g
-        if action == "drop":
-            return g.loc[~is_out]
-
-    # Apply per-group processing
-    df_result = (
-        df
-        .groupby("turbine_id", group_keys=False)
-        .apply(_process_grp)
-        .reset_index(drop=True)
-    )
+
+    is_out = pd.Series(_std_outlier_mask(df[feature].to_numpy(), df["turbine_id"].to_numpy()), index=df.index)
+    df_result = _apply_outlier_mask(df, is_out, action)
 
     after_len = len(df_result)
 
-    logger.info(f"Total outliers {action!r}: {total_outliers}")
     logger.info(f"DataFrame size before: {before_len}, after: {after_len}")
 
     return df_result
@@ -157,46 +159,148 @@ def detect_and_handle_outliers_statistically_IQR(df: pd.DataFrame,
         raise ValueError(f"action must be one of flag|drop|mask, got {action!r}")
 
     before_len = len(df)
-    total_outliers = 0
-
-    def _process_grp(g):
-        nonlocal total_outliers
-        q1, q3 = g[feature].quantile([0.25, 0.75])
-        iqr = q3 - q1
-        lo, hi = q1 - IQR_FACTOR * iqr, q3 + IQR_FACTOR * iqr
-        is_out = ~g[feature].between(lo, hi)
-
-        n_out = is_out.sum()
-        total_outliers += int(n_out)
-        if n_out:
-            logger.info(f"Turbine {g.name}: {n_out} outliers detected")
-
-        g = g.copy()
-        if action == "flag":
-            g["is_outlier"] = is_out
-            return g
-        if action == "drop":
-            return g.loc[~is_out]
-
-    # Apply per-group processing
-    df_result = (
-        df
-        .groupby("turbine_id", group_keys=False)
-        .apply(_process_grp)
-        .reset_index(drop=True)
-    )
+
+    # Per-turbine quartiles, broadcast back onto every row
+    grouped = df.groupby("turbine_id")[feature]
+    q1 = grouped.transform("quantile", 0.25)
+    q3 = grouped.transform("quantile", 0.75)
+    iqr = q3 - q1
+    lo, hi = q1 - IQR_FACTOR * iqr, q3 + IQR_FACTOR * iqr
+
+    df_result = _apply_outlier_mask(df, ~df[feature].between(lo, hi), action)
 
     after_len = len(df_result)
 
-    logger.info(f"Total outliers {action!r}: {total_outliers}")
     logger.info(f"DataFrame size before: {before_len}, after: {after_len}")
 
     return df_result
 
 
+def _mark_out_of_range(values: np.ndarray, limits: dict, out: np.ndarray) -> None:
+    """Set `out` to True where values fall outside the {"min", "max"} limits; NaN is never out of range."""
+    # Missing bounds become ±inf so every row runs the same check
+    lo = limits.get("min") if limits.get("min") is not None else -np.inf
+    hi = limits.get("max") if limits.get("max") is not None else np.inf
+    if mark_out_of_range is not None:
+        mark_out_of_range(values, lo, hi, out)
+    else:
+        out |= (values < lo) | (values > hi)
+
+
+def _duplicate_mask(turbine_ids: np.ndarray, timestamps: np.ndarray) -> np.ndarray:
+    """Mark every row after the first of each (turbine_id, timestamp); rows must be sorted on both."""
+    is_dup = np.zeros(len(turbine_ids), dtype=bool)
+    is_dup[1:] = (turbine_ids[1:] == turbine_ids[:-1]) & (timestamps[1:] == timestamps[:-1])
+    return is_dup
+
+
+def _group_starts(turbine_ids: np.ndarray) -> np.ndarray:
+    """For turbine-sorted rows, return the position each row's turbine group starts at."""
+    new_group = np.ones(len(turbine_ids), dtype=bool)
+    new_group[1:] = turbine_ids[1:] != turbine_ids[:-1]
+    return np.flatnonzero(new_group)[np.cumsum(new_group) - 1]
+
+
+def _std_outlier_mask(values: np.ndarray, turbine_ids: np.ndarray) -> np.ndarray:
+    """
+    Mark values outside mean ± OUTLIER_STD_THRESHOLD·std (ddof=1) of their turbine.
+    Missing values and turbines with a single reading are marked too, as Series.between would.
+    """
+    if outlier_mask is not None:
+        return outlier_mask(values, turbine_ids, OUTLIER_STD_THRESHOLD)
+
+    values = values.astype(np.float64)
+    _, codes = np.unique(turbine_ids, return_inverse=True)
+    valid = ~np.isnan(values)
+    n = np.bincount(codes[valid], minlength=codes.max() + 1 if len(codes) else 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.bincount(codes[valid], weights=values[valid], minlength=len(n)) / n
+        deviation = values - mean[codes]
+        var = np.bincount(codes[valid], weights=deviation[valid] ** 2, minlength=len(n)) / (n - 1)
+        std_dev = np.sqrt(np.where(n > 1, var, np.nan))
+        lo = mean[codes] - OUTLIER_STD_THRESHOLD * std_dev[codes]
+        hi = mean[codes] + OUTLIER_STD_THRESHOLD * std_dev[codes]
+        return ~((values >= lo) & (values <= hi))
+
+
+def _ffill_within_groups(values: np.ndarray, group_starts: np.ndarray, limit: int) -> np.ndarray:
+    """Forward-fill NaNs by at most `limit` rows, never carrying a value across a group start."""
+    positions = np.arange(len(values))
+    last_valid = np.maximum.accumulate(np.where(np.isnan(values), -1, positions))
+    fillable = (last_valid >= group_starts) & (positions - last_valid <= limit)
+    return np.where(fillable, values[np.maximum(last_valid, 0)], values)
+
+
+def fused_clean(df: pd.DataFrame,
+                sensor_limits: Dict = SENSOR_LIMITS,
+                feature: str = "power_output") -> pd.DataFrame:
+    """
+    Same result as remove_duplicates -> handle_missing_values -> clean_physical_limits ->
+    detect_and_handle_outliers_statistically_std (drop), built from the same mask helpers over
+    the sorted NumPy arrays and applied with a single row selection at the end.
+    """
+    before_len = len(df)
+
+    # Drop rows missing critical columns (timestamp, turbine_id), then sort once
+    critical_missing = _critical_missing(df)
+    if critical_missing.any():
+        df = df[~critical_missing]
+    df = sort_by_turbine_and_time(df)
+
+    turbine_ids = df["turbine_id"].to_numpy()
+    timestamps = df["timestamp"].to_numpy()
+
+    # Duplicates are adjacent in sorted order; every later mask works on the de-duplicated rows
+    is_dup = _duplicate_mask(turbine_ids, timestamps)
+    rows = np.flatnonzero(~is_dup)
+    turbine_ids = turbine_ids[rows]
+    logger.info(f"Removed {int(is_dup.sum())} duplicate rows.")
+
+    group_starts = _group_starts(turbine_ids)
+
+    # Forward-fill sensor gaps (2 steps, for example, 10 min if 5T freq) and flag what is still missing
+    filled = {}
+    missing = np.zeros(len(rows), dtype=bool)
+    for col in SENSOR_COLUMNS:
+        values = df[col].to_numpy()[rows]
+        if np.issubdtype(values.dtype, np.floating):
+            isnull = np.isnan(values)
+            if isnull.any():
+                logger.warning(f"Missing sensor data for turbines {set(np.unique(turbine_ids[isnull]).tolist())}")
+                values = _ffill_within_groups(values, group_starts, limit=2)
+                missing |= np.isnan(values)
+        filled[col] = values
+    logger.info(f"Data after missing value handling: {int((~missing).sum())} rows.")
+
+    # Physical limits on the filled values
+    out_of_limits = np.zeros(len(rows), dtype=bool)
+    for col, limits in sensor_limits.items():
+        if col not in df.columns:
+            logger.warning(f"Skipped {col}: not in DataFrame")
+            continue
+        values = filled[col] if col in filled else df[col].to_numpy()[rows]
+        _mark_out_of_range(values, limits, out_of_limits)
+    keep = ~missing & ~out_of_limits
+    logger.info(f"clean_physical_limits: dropped {int((~missing & out_of_limits).sum())} rows, "
+                f"{int(keep.sum())} remain.")
+
+    # Per-turbine std outliers of `feature` over the rows that survived so far
+    values = filled[feature] if feature in filled else df[feature].to_numpy()[rows]
+    is_out = np.zeros(len(rows), dtype=bool)
+    is_out[keep] = _std_outlier_mask(values[keep], turbine_ids[keep])
+    logger.info(f"Total outliers 'drop': {int(is_out.sum())}")
+    keep &= ~is_out
+
+    # Single row selection, with the forward-filled sensor values written back
+    df_result = df.iloc[rows[keep]].reset_index(drop=True)
+    for col in SENSOR_COLUMNS:
+        df_result[col] = filled[col][keep]
+
+    logger.info(f"DataFrame size before: {before_len}, after: {len(df_result)}")
+    return df_result
+
+
 def clean_data(df, sensor_limits: Dict = SENSOR_LIMITS):
-    df = remove_duplicates(df)
-    df = handle_missing_values(df)
-    df = clean_physical_limits(df, sensor_limits)
-    df = detect_and_handle_outliers_statistically_std(df)
-    return df
\ No newline at end of file
+    # Equivalent to remove_duplicates -> handle_missing_values -> clean_physical_limits ->
+    # detect_and_handle_outliers_statistically_std, fused into one pass over the data
+    return fused_clean(df, sensor_limits)
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""
+Polars implementation of the clean → daily summary chain (enabled with POLARS_BACKEND=1).
+Mirrors ingestion.cleaning.clean_data and analysis.statistics.calculate_daily_summary;
+the frame is converted to polars once and back to pandas only for the database inserts.
+"""
+from typing import Dict, Tuple
+
+import pandas as pd
+import polars as pl
+
+from ingestion.validation import SENSOR_COLUMNS
+from config.constants import SENSOR_LIMITS, OUTLIER_STD_THRESHOLD
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def remove_duplicates(df: pl.DataFrame) -> pl.DataFrame:
+    before = df.height
+    df = df.unique(subset=["timestamp", "turbine_id"], keep="first", maintain_order=True)
+    logger.info(f"Removed {before - df.height} duplicate rows.")
+    return df
+
+
+def handle_missing_values(df: pl.DataFrame) -> pl.DataFrame:
+    # Drop rows missing critical columns, then forward-fill sensor gaps (max 2 steps) per turbine
+    df = (
+        df
+        .drop_nulls(subset=["timestamp", "turbine_id"])
+        .sort(["turbine_id", "timestamp"], maintain_order=True)
+        .with_columns(pl.col(SENSOR_COLUMNS).forward_fill(limit=2).over("turbine_id"))
+        .drop_nulls(subset=SENSOR_COLUMNS)
+    )
+    logger.info(f"Data after missing value handling: {df.height} rows.")
+    return df
+
+
+def clean_physical_limits(df: pl.DataFrame, sensor_limits: dict = SENSOR_LIMITS) -> pl.DataFrame:
+    """Drop rows where any feature is outside its allowed range."""
+    before_len = df.height
+    conditions = []
+    for feature, limits in sensor_limits.items():
+        if feature not in df.columns:
+            logger.warning(f"Skipped {feature}: not in DataFrame")
+            continue
+        if limits.get("min") is not None:
+            conditions.append(pl.col(feature) >= limits["min"])
+        if limits.get("max") is not None:
+            conditions.append(pl.col(feature) <= limits["max"])
+
+    if conditions:
+        df = df.filter(*conditions)
+    logger.info(f"clean_physical_limits: dropped {before_len - df.height} rows, {df.height} remain.")
+    return df
+
+
+def drop_outliers_statistically_std(df: pl.DataFrame, feature: str = "power_output") -> pl.DataFrame:
+    """Per turbine, drop rows whose `feature` is outside mean ± OUTLIER_STD_THRESHOLD·std."""
+    before_len = df.height
+    values = pl.col(feature).cast(pl.Float64)
+    mean = values.mean().over("turbine_id")
+    std_dev = values.std().over("turbine_id")
+    # A null bound (single-reading turbine) filters the row out, like Series.between in pandas
+    df = df.filter(pl.col(feature).is_between(mean - OUTLIER_STD_THRESHOLD * std_dev,
+                                              mean + OUTLIER_STD_THRESHOLD * std_dev))
+    logger.info(f"Total outliers 'drop': {before_len - df.height}")
+    return df
+
+
+def calculate_daily_summary(df: pl.DataFrame) -> pl.DataFrame:
+    """Calculate min, max, mean and total power output per turbine per day."""
+    power_output = pl.col("power_output")
+    if df.schema["power_output"] == pl.Float32:
+        # Same widening as ingestion.utils.to_float64: through the shortest decimal repr
+        power_output = power_output.cast(pl.Utf8)
+    power_output = power_output.cast(pl.Float64)
+    return (
+        df
+        .group_by(pl.col("timestamp").dt.truncate("1d").alias("date"), "turbine_id")
+        .agg(
+            power_output.min().alias("min_power_output"),
+            power_output.max().alias("max_power_output"),
+            power_output.mean().alias("mean_power_output"),
+            power_output.sum().alias("total_power_output"),
+        )
+        .sort(["date", "turbine_id"])
+    )
+
+
+def clean_and_summarise(df: pd.DataFrame,
+                        sensor_limits: Dict = SENSOR_LIMITS) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Run the full cleaning chain and the daily summary in polars; returns pandas frames."""
+    pl_df = pl.from_pandas(df)
+    pl_df = remove_duplicates(pl_df)
+    pl_df = handle_missing_values(pl_df)
+    pl_df = clean_physical_limits(pl_df, sensor_limits)
+    pl_df = drop_outliers_statistically_std(pl_df)
+    summary = calculate_daily_summary(pl_df)
+    return _to_pandas(pl_df), _to_pandas(summary)
+
+
+def _to_pandas(df: pl.DataFrame) -> pd.DataFrame:
+    # Column-wise via NumPy, so pyarrow is not needed for the conversion
+    return pd.DataFrame({col: df.get_column(col).to_numpy() for col in df.columns})
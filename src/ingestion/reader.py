@@ -1,41 +1,186 @@
+import os
+from functools import lru_cache
 from typing import Optional
+import numpy as np
 import pandas as pd
 
-from ingestion.validation import REQUIRED_COLUMNS, TURBINE_GROUPS
-from ingestion.utils import get_turbine_group_from_filename
+from ingestion.validation import REQUIRED_COLUMNS, NON_TS_DTYPES, COMPACT_DTYPES, USECOLS, TURBINE_GROUPS
+from ingestion.utils import get_turbine_group_from_filename, sort_by_turbine_and_time
 
 import logging
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+try:
+    import pyarrow as pa
+    CSV_ENGINE = "pyarrow"  # multi-threaded parser
+except ImportError:
+    pa = None
+    CSV_ENGINE = "c"
+
+# Column checks diff against an Index, which runs in C on its hashtable
+REQUIRED_INDEX = pd.Index(USECOLS)
+
+# Larger than the default 8 KiB, so big files are read with far fewer syscalls
+READ_BUFFER_SIZE = 1 << 20
+
+
+def read_csv_file(path: str, chunksize: Optional[int] = None, compact: bool = False,
+                  backend: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """
+    backend="pyarrow" returns Arrow-backed columns (pd.ArrowDtype) straight from the pyarrow
+    parser, for zero-copy hand-off to Arrow consumers such as polars or Parquet writers.
+    The pandas pipeline steps expect the default NumPy-backed frames.
+    """
+    if backend == "pyarrow":
+        if pa is None:
+            raise ImportError("backend='pyarrow' requires pyarrow to be installed")
+        if chunksize:
+            raise ValueError("chunksize is not supported with backend='pyarrow'")
+    arrow_options = {"dtype_backend": "pyarrow"} if backend == "pyarrow" else {}
 
-def read_csv_file(path: str) -> Optional[pd.DataFrame]:
     try:
-        df = pd.read_csv(path)
+        if chunksize:
+            return _read_csv_chunks(path, chunksize, compact)
+        with open(path, "rb", buffering=READ_BUFFER_SIZE) as fh:
+            if not _has_required_columns(fh):
+                return None
+            # Only the required columns are parsed; wide exports carry many channels we never use.
+            # turbine_id is always parsed as int64: a narrower parse dtype wraps out-of-range IDs.
+            # The pyarrow engine infers column types and casts afterwards, so it is given Arrow
+            # dtypes: Arrow's casts are checked where NumPy's astype silently wraps (e.g. a
+            # turbine_id too large for int64 inferred as float64)
+            parse_backend = "pyarrow" if CSV_ENGINE == "pyarrow" else backend
+            df = pd.read_csv(fh, engine=CSV_ENGINE, usecols=USECOLS, dtype=_dtypes(False, parse_backend),
+                             parse_dates=["timestamp"], cache_dates=True,
+                             memory_map=CSV_ENGINE == "c" and _can_memory_map(fh), **arrow_options)
+            if parse_backend != backend:
+                df = df.astype(_dtypes(False, backend))
+        if compact:
+            turbine_ids = _downcast_turbine_ids(df["turbine_id"], _dtypes(True, backend)["turbine_id"])
+            if turbine_ids is None:
+                return None
+            df["turbine_id"] = turbine_ids
         return df
     except FileNotFoundError:
         logger.error(f"File not found: {path}")
+    except IsADirectoryError:
+        logger.error(f"Not a file: {path}")
     except pd.errors.EmptyDataError:
         logger.error(f"File is empty: {path}")
     except pd.errors.ParserError:
         logger.error(f"File is corrupted or badly formatted: {path}")
-    except Exception as e:
-        logger.error(f"Unexpected error reading {path}: {str(e)}")
+    except UnicodeDecodeError:
+        raise  # a ValueError subclass, but an encoding problem rather than bad values
+    except (ValueError, OverflowError) as e:
+        # A value the parser cannot convert to its column dtype (e.g. text in a numeric column,
+        # or an integer too large for int64)
+        logger.error(f"Could not parse {path}: {str(e)}")
     return None
 
 
-def validate_dataframe(df: pd.DataFrame) -> Optional[pd.DataFrame]:
+def _dtypes(compact: bool, backend: Optional[str] = None) -> dict:
+    dtypes = COMPACT_DTYPES if compact else NON_TS_DTYPES
+    if backend == "pyarrow":
+        return {col: pd.ArrowDtype(pa.from_numpy_dtype(np.dtype(dtype))) for col, dtype in dtypes.items()}
+    return dtypes
+
+
+def _read_csv_chunks(path: str, chunksize: int, compact: bool) -> Optional[pd.DataFrame]:
+    # Bounded-memory read: each chunk is typed and validated before the next is parsed.
+    # The pyarrow engine does not support chunksize, so this always uses the c parser.
+    chunks = []
+    with open(path, "rb", buffering=READ_BUFFER_SIZE) as fh:
+        if not _has_required_columns(fh):
+            return None
+        with pd.read_csv(fh, chunksize=chunksize, usecols=USECOLS, dtype=_dtypes(False),
+                         parse_dates=["timestamp"], cache_dates=True,
+                         memory_map=_can_memory_map(fh)) as reader:
+            for chunk in reader:
+                # Sorting waits for the concatenated frame (validate_dataframe in read_and_validate_csv)
+                chunk = _validate_columns_and_dtypes(chunk, compact)
+                if chunk is None:
+                    return None
+                chunks.append(chunk)
+
+    if not chunks:
+        return None
+    return pd.concat(chunks, ignore_index=True)
+
+
+def _can_memory_map(fh) -> bool:
+    # The c parser reads straight from a memory map (pyarrow does not support it);
+    # empty files cannot be mapped and must reach the parser's EmptyDataError instead
+    return os.fstat(fh.fileno()).st_size > 0
+
+
+def _has_required_columns(fh) -> bool:
+    # Checked on the header up front, so usecols never fails on an absent column;
+    # the handle is rewound for the real parse
+    header = pd.read_csv(fh, nrows=0).columns
+    fh.seek(0)
+    missing_cols = REQUIRED_INDEX.difference(header)
+    if len(missing_cols):
+        logger.error(f"Missing required columns: {set(missing_cols)}")
+        return False
+    return True
+
+
+def validate_dataframe(df: pd.DataFrame, compact: bool = False,
+                       backend: Optional[str] = None) -> Optional[pd.DataFrame]:
+    df = _validate_columns_and_dtypes(df, compact, backend)
+    if df is None:
+        return None
+
+    # Sort once on the typed columns, in the order the cleaning steps rely on
+    return sort_by_turbine_and_time(df)
+
+
+def _validate_columns_and_dtypes(df: pd.DataFrame, compact: bool,
+                                 backend: Optional[str] = None) -> Optional[pd.DataFrame]:
     # Validate column names
-    missing_cols = set(REQUIRED_COLUMNS) - set(df.columns)
-    if missing_cols:
-        logger.error(f"Missing required columns: {missing_cols}")
+    missing_cols = REQUIRED_INDEX.difference(df.columns)
+    if len(missing_cols):
+        logger.error(f"Missing required columns: {set(missing_cols)}")
         return None
 
+    # read_csv_file already parses to the final dtypes; only coerce frames that don't match
+    dtypes = _dtypes(compact, backend)
+    if backend == "pyarrow":
+        # Arrow timestamps keep the unit the parser chose, so only the kind is checked
+        timestamp_ok = df["timestamp"].dtype.kind == "M" and df["timestamp"].dt.tz is None
+    else:
+        timestamp_ok = df["timestamp"].dtype == REQUIRED_COLUMNS["timestamp"]
+    if timestamp_ok and all(df[col].dtype == dtype for col, dtype in dtypes.items()):
+        return df
+
     # Enforce data types
     try:
-        df["timestamp"] = pd.to_datetime(df["timestamp"], errors="raise")
-        df = df.astype({k: v for k, v in REQUIRED_COLUMNS.items() if k != "timestamp"})
+        # dtype.kind is "M" for NumPy, tz-aware and Arrow timestamps alike
+        if df["timestamp"].dtype.kind != "M":
+            df["timestamp"] = _parse_timestamps(df["timestamp"])
+        if df["timestamp"].dt.tz is not None:
+            # Offsets (e.g. ISO "...Z") are dropped and the wall-clock time kept: that is the value
+            # the database stores and the day filter_today_data selects on
+            df["timestamp"] = df["timestamp"].dt.tz_localize(None)
+        if backend == "pyarrow":
+            if not isinstance(df["timestamp"].dtype, pd.ArrowDtype):
+                df["timestamp"] = df["timestamp"].astype(pd.ArrowDtype(pa.timestamp("ns")))
+        elif df["timestamp"].dtype != REQUIRED_COLUMNS["timestamp"]:
+            # The pyarrow engine parses to datetime64[s]; the frame's dtype must not depend on the engine
+            df["timestamp"] = df["timestamp"].astype(REQUIRED_COLUMNS["timestamp"])
+        # Cast column by column so columns that already match are left untouched
+        for col, dtype in dtypes.items():
+            if df[col].dtype == dtype:
+                continue
+            if col == "turbine_id" and compact:
+                turbine_ids = _downcast_turbine_ids(df[col], dtype)
+                if turbine_ids is None:
+                    return None
+                df[col] = turbine_ids
+            else:
+                df[col] = df[col].astype(dtype, copy=False)
     except Exception as e:
         logger.error(f"Data type coercion failed: {e}")
         return None
@@ -43,35 +188,84 @@ def validate_dataframe(df: pd.DataFrame) -> Optional[pd.DataFrame]:
     return df
 
 
+def _downcast_turbine_ids(turbine_ids: pd.Series, dtype) -> Optional[pd.Series]:
+    """Cast turbine IDs to the compact dtype, or return None if any of them would wrap around."""
+    values = turbine_ids.to_numpy(dtype=NON_TS_DTYPES["turbine_id"])
+    bounds = np.iinfo(COMPACT_DTYPES["turbine_id"])
+    out_of_range = values[(values < bounds.min) | (values > bounds.max)]
+    if out_of_range.size:
+        logger.error(f"Turbine IDs do not fit in {COMPACT_DTYPES['turbine_id']}: {set(out_of_range.tolist())}")
+        return None
+    return turbine_ids.astype(dtype)
+
+
+def _parse_timestamps(timestamps: pd.Series) -> pd.Series:
+    # ISO 8601 parses in C without per-element format inference; anything else is inferred per value
+    try:
+        return pd.to_datetime(timestamps, format="ISO8601", errors="raise", cache=True)
+    except ValueError:
+        return pd.to_datetime(timestamps, format="mixed", errors="raise", cache=True)
+
+
 def validate_turbine_ids(df: pd.DataFrame, group_name: str) -> bool:
     turbine_group = get_turbine_group_from_filename(group_name)
     min_id, max_id = TURBINE_GROUPS[turbine_group]
 
+    turbine_ids = np.unique(df["turbine_id"].to_numpy())
+
     # Check if any expected turbines are missing
-    missing_turbines = set(range(min_id, max_id + 1)) - set(df["turbine_id"].unique())
-    if missing_turbines:
+    missing_turbines = np.setdiff1d(np.arange(min_id, max_id + 1), turbine_ids, assume_unique=True)
+    if missing_turbines.size:
         # We decide to continue processing and handle this later in data cleaning
-        logger.warning(f"Missing turbines in {group_name}: {missing_turbines}")
+        logger.warning(f"Missing turbines in {group_name}: {set(missing_turbines.tolist())}")
         # Optionally, we could decide to halt processing
 
     # Check if all turbine IDs are within the allowed range
-    invalid_turbines = df[~df["turbine_id"].between(min_id, max_id)]
-    if not invalid_turbines.empty:
-        logger.error(f"Turbine IDs outside expected range in {group_name}: {invalid_turbines['turbine_id'].unique()}")
+    invalid_turbines = turbine_ids[(turbine_ids < min_id) | (turbine_ids > max_id)]
+    if invalid_turbines.size:
+        logger.error(f"Turbine IDs outside expected range in {group_name}: {invalid_turbines}")
         return False
 
     return True
 
 
-def read_and_validate_csv(path: str, group_name: str) -> Optional[pd.DataFrame]:
-    df = read_csv_file(path)
-    df = df.sort_values('timestamp')
+def read_and_validate_csv(path: str, group_name: str, chunksize: Optional[int] = None,
+                          compact: bool = False, backend: Optional[str] = None,
+                          cache: bool = False) -> Optional[pd.DataFrame]:
+    """
+    cache=True keeps the last few validated frames in memory, keyed on the file's mtime and size
+    so a rewritten file is parsed again. Meant for notebooks and tests that reload the same
+    files; the pipeline reads every file once and leaves it off.
+    """
+    if not cache:
+        return _read_and_validate_csv(path, group_name, chunksize, compact, backend)
+
+    try:
+        st = os.stat(path)
+    except OSError:
+        # logs the read failure
+        return _read_and_validate_csv(path, group_name, chunksize, compact, backend)
+
+    df = _load_validated_csv(path, group_name, chunksize, compact, backend, st.st_mtime_ns, st.st_size)
+    # A deep copy: a shallow one shares the value buffers, so in-place edits would reach the cache
+    return None if df is None else df.copy()
+
+
+@lru_cache(maxsize=4)
+def _load_validated_csv(path: str, group_name: str, chunksize: Optional[int], compact: bool,
+                        backend: Optional[str], mtime_ns: int, size: int) -> Optional[pd.DataFrame]:
+    return _read_and_validate_csv(path, group_name, chunksize, compact, backend)
+
+
+def _read_and_validate_csv(path: str, group_name: str, chunksize: Optional[int],
+                           compact: bool, backend: Optional[str]) -> Optional[pd.DataFrame]:
+    df = read_csv_file(path, chunksize=chunksize, compact=compact, backend=backend)
     if df is None:
         logger.error(f"Skipping file due to read failure: {path}")
         return None
 
     try:
-        df = validate_dataframe(df)
+        df = validate_dataframe(df, compact, backend)
         if df is None:
             logger.error(f"Skipping file due to validation failure: {path}")
             return None
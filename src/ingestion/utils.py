@@ -1,5 +1,6 @@
 import re
 from datetime import date
+import numpy as np
 import pandas as pd
 
 
@@ -15,6 +16,52 @@ def get_turbine_group_from_filename(group_name: str) -> int:
 def filter_today_data(df: pd.DataFrame, target_date: date) -> pd.DataFrame:
     """
     Filters the dataframe to only include rows from the target_date.
+    On frames sorted by (turbine_id, timestamp) each turbine's rows for the day are found with
+    a binary search; otherwise a datetime64 range mask is used.
     """
-    mask = df['timestamp'].dt.date == target_date
-    return df[mask].copy()
\ No newline at end of file
+    start = np.datetime64(target_date)
+    end = start + np.timedelta64(1, "D")
+    timestamps = df['timestamp']
+    if timestamps.dt.tz is not None:
+        # Compare on the local wall-clock time, i.e. the day .dt.date would report
+        timestamps = timestamps.dt.tz_localize(None)
+    timestamps = timestamps.to_numpy()
+
+    if not is_sorted_by_turbine_and_time(df):
+        return df[(timestamps >= start) & (timestamps < end)].copy()
+
+    turbine_ids = df['turbine_id'].to_numpy()
+    boundaries = np.flatnonzero(turbine_ids[1:] != turbine_ids[:-1]) + 1
+    positions = []
+    for lo, hi in zip(np.r_[0, boundaries], np.r_[boundaries, len(df)]):
+        first, last = np.searchsorted(timestamps[lo:hi], [start, end])
+        positions.append(np.arange(lo + first, lo + last))
+    return df.iloc[np.concatenate(positions)].copy()
+
+
+def to_float64(col: pd.Series) -> pd.Series:
+    """
+    Widen a sensor column to float64. float32 values go through their shortest decimal repr,
+    so 3.288 stays 3.288 instead of becoming 3.2880001068115234.
+    """
+    if col.dtype != np.float32:
+        return col.astype(np.float64)
+    return pd.Series(col.to_numpy().astype(str).astype(np.float64), index=col.index, name=col.name)
+
+
+def sort_by_turbine_and_time(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Sort rows by (turbine_id, timestamp), the order the cleaning steps work in.
+    Uses a stable mergesort and skips the sort entirely when the frame is already ordered.
+    """
+    if is_sorted_by_turbine_and_time(df):
+        return df
+    return df.sort_values(["turbine_id", "timestamp"], kind="mergesort")
+
+
+def is_sorted_by_turbine_and_time(df: pd.DataFrame) -> bool:
+    """Check in one vectorized pass whether rows are ordered by (turbine_id, timestamp)."""
+    turbine_ids = df["turbine_id"].to_numpy()
+    timestamps = df["timestamp"].to_numpy()
+    same_turbine = turbine_ids[1:] == turbine_ids[:-1]
+    return bool(np.all((turbine_ids[1:] > turbine_ids[:-1]) | (same_turbine & (timestamps[1:] >= timestamps[:-1]))))
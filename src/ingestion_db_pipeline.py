@@ -1,5 +1,9 @@
 from datetime import date
+from typing import Optional, Tuple
 
+import pandas as pd
+
+from config.constants import POLARS_BACKEND
 from ingestion.reader import read_and_validate_csv
 from ingestion.cleaning import clean_data
 from ingestion.utils import filter_today_data
@@ -17,14 +21,14 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def run_pipeline(csv_file_path: str,
+def prepare_data(csv_file_path: str,
                  target_date: date = None,
-                 update_existing: bool = False,
-                 group_name: str = None,
-                 window_days: int = 7):
-    # Ensure tables exist (no-op if already created)
-    create_database()
-
+                 group_name: str = None) -> Optional[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Read, validate and clean a CSV file and compute its daily summary.
+    Does not touch the database, so it can safely run in a worker process.
+    Returns (cleaned readings, daily summary), or None if there is nothing to store.
+    """
     if not group_name:
         group_name = csv_file_path.split('/')[-1].split('.')[0]
 
@@ -34,15 +38,21 @@ def run_pipeline(csv_file_path: str,
 
     if df is None:
         logger.error("Failed to read or validate the CSV file. Exiting.")
-        return
+        return None
 
     # Filter today's data
     if target_date:
         df = filter_today_data(df, target_date)
-        print(len(df))
+        logger.debug(f"{len(df)} rows for {target_date}.")
         if df.empty:
             logger.warning(f"No data for {target_date}. Skipping insert.")
-            return
+            return None
+
+    if POLARS_BACKEND:
+        from ingestion.polars_backend import clean_and_summarise
+
+        logger.info("Cleaning the data and calculating summary statistics with polars...")
+        return clean_and_summarise(df)
 
     # Clean the data (handle missing values, outliers, duplicates)
     logger.info("Cleaning the data...")
@@ -52,6 +62,15 @@ def run_pipeline(csv_file_path: str,
     logger.info("Calculating summary statistics...")
     summary_df = calculate_daily_summary(df)
 
+    return df, summary_df
+
+
+def store_and_detect(df: pd.DataFrame,
+                     summary_df: pd.DataFrame,
+                     target_date: date = None,
+                     update_existing: bool = False,
+                     window_days: int = 7):
+    """Insert prepared readings and summaries, then detect and store daily anomalies."""
     # Insert or update data in the database
     logger.info("Inserting/Updating data in the database...")
     with get_db_session() as session:
@@ -73,4 +92,23 @@ def run_pipeline(csv_file_path: str,
                 logger.info("Inserting daily anomalies...")
                 insert_reading_level_anomalies(session, anomalies_df)
 
-    logger.info("Data processing complete and stored in the database.")
\ No newline at end of file
+    logger.info("Data processing complete and stored in the database.")
+
+
+def run_pipeline(csv_file_path: str,
+                 target_date: date = None,
+                 update_existing: bool = False,
+                 group_name: str = None,
+                 window_days: int = 7):
+    # Ensure tables exist (no-op if already created)
+    create_database()
+
+    prepared = prepare_data(csv_file_path, target_date=target_date, group_name=group_name)
+    if prepared is None:
+        return
+
+    df, summary_df = prepared
+    store_and_detect(df, summary_df,
+                     target_date=target_date,
+                     update_existing=update_existing,
+                     window_days=window_days)
@@ -0,0 +1,68 @@
+"""
+Process-local cache of per-turbine daily power totals, keyed by database and day.
+
+Consecutive runs of the daily pipeline ask for overlapping rolling windows, so only the
+days that are not cached yet have to be aggregated from turbine_readings. Entries are
+invalidated whenever readings for that day are written through crud, and the least
+recently used days are dropped once MAX_DAYS are cached.
+"""
+from collections import OrderedDict
+from datetime import date
+from typing import Hashable, Iterable, List, Tuple
+
+import pandas as pd
+
+# Days cached across all databases: several years of one database, or a week-long window over many
+MAX_DAYS = 1024
+
+_daily_totals: "OrderedDict[Tuple[Hashable, date], pd.DataFrame]" = OrderedDict()
+
+
+def _db_key(bind) -> Hashable:
+    """Identify the database behind an engine or connection."""
+    engine = getattr(bind, "engine", bind)
+    # Separate in-memory databases all share the URL "sqlite://", so those are told apart by engine
+    if engine.url.database in (None, "", ":memory:"):
+        return engine
+    return engine.url.render_as_string(hide_password=False)
+
+
+def missing_days(bind, days: Iterable[date]) -> List[date]:
+    """Return the days that have no cached totals for this database."""
+    key = _db_key(bind)
+    return [d for d in days if (key, d) not in _daily_totals]
+
+
+def store(bind, days: Iterable[date], totals: pd.DataFrame) -> None:
+    """Cache the (turbine_id, date, daily_total) rows of `totals` for each of `days` (empty if absent)."""
+    key = _db_key(bind)
+    by_day = dict(tuple(totals.groupby("date"))) if not totals.empty else {}
+    for d in days:
+        _daily_totals[(key, d)] = by_day.get(d, totals.iloc[0:0])
+        _daily_totals.move_to_end((key, d))
+    while len(_daily_totals) > MAX_DAYS:
+        _daily_totals.popitem(last=False)
+
+
+def get(bind, days: Iterable[date]) -> pd.DataFrame:
+    """Concatenate the cached totals for `days`; all of them must be cached."""
+    key = _db_key(bind)
+    frames = []
+    for d in days:
+        _daily_totals.move_to_end((key, d))
+        if not _daily_totals[(key, d)].empty:
+            frames.append(_daily_totals[(key, d)])
+    if not frames:
+        return pd.DataFrame(columns=["turbine_id", "date", "daily_total"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def invalidate(bind, days: Iterable[date]) -> None:
+    """Drop cached totals for days whose readings changed."""
+    key = _db_key(bind)
+    for d in days:
+        _daily_totals.pop((key, d), None)
+
+
+def clear() -> None:
+    _daily_totals.clear()
@@ -1,20 +1,56 @@
 import logging
-from typing import Any, Dict, List, Optional
+import sqlite3
+from typing import Optional
 
 from datetime import date, timedelta
 
+import numpy as np
 import pandas as pd
 
-from sqlalchemy import func, cast, Date
+from sqlalchemy import func, cast, select, union_all, literal_column, Date, DateTime
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
+from ingestion.utils import to_float64
+from persistence import _stats_cache
 from persistence.models import TurbineReading, DailySummary, DailyAnomaly
 
 logger = logging.getLogger(__name__)
 
 
+def _per_turbine_mean_std(db: Session, values, mean_label: str, std_label: str) -> pd.DataFrame:
+    """
+    Aggregate a (turbine_id, value) subquery into per-turbine mean and sample std inside SQLite.
+    SQLite has no STDDEV, so the variance is computed in a second pass against the per-turbine mean
+    and only the square root is taken in pandas, on one row per turbine.
+    """
+    means = (
+        db.query(
+            values.c.turbine_id,
+            func.avg(values.c.value).label("mean"),
+            func.count(values.c.value).label("n"),
+        )
+        .group_by(values.c.turbine_id)
+        .subquery()
+    )
+    deviation = values.c.value - means.c.mean
+    q = (
+        db.query(
+            means.c.turbine_id,
+            func.max(means.c.mean).label(mean_label),
+            # n - 1 == 0 divides to NULL, i.e. NaN std for a single day like pandas
+            (func.sum(deviation * deviation) / (func.max(means.c.n) - 1.0)).label("variance"),
+        )
+        .join(means, values.c.turbine_id == means.c.turbine_id)
+        .group_by(means.c.turbine_id)
+        .order_by(means.c.turbine_id)
+    )
+    stats = pd.read_sql(q.statement, db.bind)
+    stats[std_label] = np.sqrt(stats.pop("variance").astype(float))
+    return stats
+
+
 def load_historical_daily_totals_stats(
         db: Session,
         before_date: date,
@@ -22,35 +58,36 @@ def load_historical_daily_totals_stats(
 ) -> pd.DataFrame:
     """
     Compute the historical mean & std of *daily total* power_output per turbine,
-    based on TurbineReading.
+    based on DailySummary.total_power_output (falling back to summing TurbineReading for days
+    without a complete set of stored totals). Over the full history the mean and variance are
+    aggregated in SQL. With a rolling window, per-day totals are cached in-process
+    (see persistence._stats_cache) and invalidated when data for that day is written.
 
     Returns DataFrame with columns:
       turbine_id, hist_mean_daily_output, hist_std_daily_output
     """
-    # Build base query: sum power_output per day per turbine
-    q = (
-        db.query(
-            TurbineReading.turbine_id,
-            func.date(TurbineReading.timestamp).label("date"),
-            func.sum(TurbineReading.power_output).label("daily_total"),
-        )
-        .filter(TurbineReading.timestamp < before_date)  # exclude today
-    )
+    columns = ["turbine_id", "hist_mean_daily_output", "hist_std_daily_output"]
+    if window_days is None:
+        # exclude today
+        stats = _per_turbine_mean_std(db, _daily_totals_query(None, before_date), *columns[1:])
+        return stats if not stats.empty else pd.DataFrame(columns=columns)
 
-    # apply rolling window if requested
-    if window_days is not None:
-        cutoff = before_date - timedelta(days=window_days)
-        q = q.filter(TurbineReading.timestamp >= cutoff)
-
-    # group by turbine_id + date
-    q = q.group_by(TurbineReading.turbine_id, func.date(TurbineReading.timestamp))
-    # read into pandas
-    df = pd.read_sql(q.statement, db.bind, parse_dates=["date"])
+    # Rolling window: reuse per-day totals cached by earlier runs, only aggregate the rest.
+    # At most window_days rows per turbine, so the final mean/std is taken in pandas.
+    days = [before_date - timedelta(days=i) for i in range(window_days, 0, -1)]
+    bind = db.get_bind()
+    missing = _stats_cache.missing_days(bind, days)
+    # Cached days are read before storing the rest, which may evict them from a full cache
+    df = _stats_cache.get(bind, [d for d in days if d not in missing])
+    if missing:
+        totals = _load_daily_totals(db, min(missing), max(missing) + timedelta(days=1))
+        totals = totals[totals["date"].isin(missing)]
+        _stats_cache.store(bind, missing, totals)
+        frames = [frame for frame in (df, totals) if not frame.empty]
+        df = pd.concat(frames, ignore_index=True) if frames else df
 
     if df.empty:
-        return pd.DataFrame(
-            columns=["turbine_id", "hist_mean_daily_output", "hist_std_daily_output"]
-        )
+        return pd.DataFrame(columns=columns)
 
     # aggregate per turbine
     stats = (
@@ -65,6 +102,57 @@ def load_historical_daily_totals_stats(
     return stats
 
 
+def _daily_totals_query(start: Optional[date], end: date):
+    """
+    Subquery of (turbine_id, date, value) daily total power_output rows for days in [start, end)
+    (start=None means no lower bound). Days with a complete set of stored totals are read from
+    DailySummary; every other day (no summary rows, or rows written before the column existed)
+    is summed from TurbineReading.
+    """
+    summary_day = func.date(DailySummary.date)
+    summary_range = [DailySummary.date < end] + ([DailySummary.date >= start] if start is not None else [])
+    complete_days = (
+        select(summary_day)
+        .where(*summary_range)
+        .group_by(summary_day)
+        # count(column) skips NULLs, so this holds only when every row of the day has a total
+        .having(func.count(DailySummary.total_power_output) == func.count())
+    )
+    stored = (
+        select(
+            DailySummary.turbine_id,
+            summary_day.label("date"),
+            DailySummary.total_power_output.label("value"),
+        )
+        .where(*summary_range)
+        .where(summary_day.in_(complete_days))
+    )
+
+    reading_day = func.date(TurbineReading.timestamp)
+    readings_range = [TurbineReading.timestamp < end] + (
+        [TurbineReading.timestamp >= start] if start is not None else [])
+    from_readings = (
+        select(
+            TurbineReading.turbine_id,
+            reading_day.label("date"),
+            func.sum(TurbineReading.power_output).label("value"),
+        )
+        .where(*readings_range)
+        .where(reading_day.not_in(complete_days))
+        .group_by(TurbineReading.turbine_id, reading_day)
+    )
+    return union_all(stored, from_readings).subquery()
+
+
+def _load_daily_totals(db: Session, start: date, end: date) -> pd.DataFrame:
+    """Daily total power_output per turbine for days in [start, end), as (turbine_id, date, daily_total)."""
+    totals = _daily_totals_query(start, end)
+    q = select(totals.c.turbine_id, totals.c.date, totals.c.value.label("daily_total"))
+    df = pd.read_sql(q, db.bind, parse_dates=["date"])
+    df["date"] = df["date"].dt.date
+    return df
+
+
 def load_historical_daily_avg_stats(
         db: Session, before_date: date, window_days: Optional[int] = None
 ) -> pd.DataFrame:
@@ -75,9 +163,8 @@ def load_historical_daily_avg_stats(
     """
     # Build base query
     q_ = db.query(
-        DailySummary.turbine_id,
-        DailySummary.mean_power_output,
-        DailySummary.date
+        DailySummary.turbine_id.label("turbine_id"),
+        DailySummary.mean_power_output.label("value"),
     ).filter(DailySummary.date < before_date)
 
     # Apply rolling‐window filter if requested
@@ -85,31 +172,56 @@ def load_historical_daily_avg_stats(
         cutoff = before_date - timedelta(days=window_days)
         q_ = q_.filter(DailySummary.date >= cutoff)
 
-    # Read into pandas for fast group‐agg
-    df = pd.read_sql(q_.statement, db.bind, parse_dates=["date"])
+    # Compute per‐turbine mean & std of daily averages in SQL
+    stats = _per_turbine_mean_std(db, q_.subquery(), "hist_mean_power_output", "hist_std_power_output")
 
-    if df.empty:
+    if stats.empty:
         # no history at all
         return pd.DataFrame(columns=["turbine_id", "hist_mean_power_output", "hist_std_power_output"])
-
-    # Compute per‐turbine mean & std of daily averages
-    stats = (
-        df
-        .groupby("turbine_id")["mean_power_output"]
-        .agg(hist_mean_power_output="mean", hist_std_power_output="std")
-        .reset_index()
-    )
     return stats
 
 
+def _executemany(db: Session, stmt, df: pd.DataFrame) -> int:
+    """
+    Execute an INSERT for every row of `df` through the DBAPI cursor of the session's connection.
+    The statement is compiled once with positional parameters and the rows are bound from
+    column lists, instead of materialising one dict per row. Returns the affected row count.
+    """
+    compiled = stmt.compile(dialect=db.get_bind().dialect, column_keys=list(df.columns))
+    columns = []
+    for name in compiled.positiontup:
+        if isinstance(stmt.table.c[name].type, DateTime):
+            columns.append(_to_sqlite_datetime_strings(df[name]))
+        elif df[name].dtype == np.float32:
+            columns.append(to_float64(df[name]).tolist())
+        else:
+            columns.append(df[name].tolist())
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.executemany(str(compiled), zip(*columns))
+        return cursor.rowcount
+    finally:
+        cursor.close()
+
+
+def _to_sqlite_datetime_strings(col: pd.Series) -> list:
+    """
+    Render datetimes in the text format SQLAlchemy's SQLite DateTime type writes and compares
+    against ("%Y-%m-%d %H:%M:%S.%f"), using NumPy's vectorized formatting instead of strftime.
+    """
+    values = pd.to_datetime(col).to_numpy(dtype="datetime64[us]")
+    return np.strings.replace(np.datetime_as_string(values, unit="us"), "T", " ").tolist()
+
+
 def insert_or_update_readings_from_dataframe(
         db: Session, df: pd.DataFrame, update_existing: bool = False
 ) -> None:
     """
     Insert new turbine readings or update existing ones based on timestamp+turbine_id.
     """
-    records: List[Dict[str, Any]] = df.to_dict(orient="records")
-    stmt = sqlite_insert(TurbineReading).values(records)
+    _stats_cache.invalidate(db.get_bind(), df["timestamp"].dt.date.unique())
+    stmt = sqlite_insert(TurbineReading.__table__)
 
     if update_existing:
         stmt = stmt.on_conflict_do_update(
@@ -124,9 +236,9 @@ def insert_or_update_readings_from_dataframe(
         stmt = stmt.on_conflict_do_nothing(index_elements=["timestamp", "turbine_id"])
 
     try:
-        result = db.execute(stmt)
-        logger.info(f"Upserted {result.rowcount or 0} turbine readings.")
-    except SQLAlchemyError:
+        rowcount = _executemany(db, stmt, df)
+        logger.info(f"Upserted {rowcount} turbine readings.")
+    except (SQLAlchemyError, sqlite3.Error):
         logger.exception("Failed to insert/update turbine readings")
         db.rollback()
         raise
@@ -134,16 +246,41 @@ def insert_or_update_readings_from_dataframe(
 
 def insert_daily_summary(db: Session, summary_df: pd.DataFrame) -> None:
     """
-    Bulk-insert daily summary statistics. Skip duplicates on (date, turbine_id).
+    Bulk-insert daily summary statistics. On duplicates (date, turbine_id) every statistic is
+    recomputed from the stored readings, so a day ingested from several files ends up
+    summarising all of them. Readings must be written before their summaries.
     """
-    records = summary_df.to_dict(orient="records")
-    stmt = sqlite_insert(DailySummary).values(records)
-    stmt = stmt.on_conflict_do_nothing(index_elements=["date", "turbine_id"])
+    _stats_cache.invalidate(db.get_bind(), pd.to_datetime(summary_df["date"]).dt.date.unique())
+    stmt = sqlite_insert(DailySummary.__table__)
+    # Written as literal columns: stmt.excluded would add "daily_summary AS excluded" to the
+    # subquery's FROM instead of correlating, and a bound "+1 day" would be a parameter that
+    # _executemany has no column for
+    readings = TurbineReading.__table__.c
+    excluded_date = literal_column("excluded.date")
+
+    def day_aggregate(agg):
+        return (
+            select(agg(readings.power_output))
+            .where(readings.turbine_id == literal_column("excluded.turbine_id"))
+            .where(readings.timestamp >= excluded_date)
+            .where(readings.timestamp < func.datetime(excluded_date, literal_column("'+1 day'")))
+            .scalar_subquery()
+        )
+
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["date", "turbine_id"],
+        set_={
+            "min_power_output": day_aggregate(func.min),
+            "max_power_output": day_aggregate(func.max),
+            "mean_power_output": day_aggregate(func.avg),
+            "total_power_output": day_aggregate(func.sum),
+        },
+    )
 
     try:
-        result = db.execute(stmt)
-        logger.info(f"Inserted {result.rowcount or 0} daily summary records.")
-    except SQLAlchemyError:
+        rowcount = _executemany(db, stmt, summary_df)
+        logger.info(f"Inserted {rowcount} daily summary records.")
+    except (SQLAlchemyError, sqlite3.Error):
         logger.exception("Failed to insert daily summaries")
         db.rollback()
         raise
@@ -157,14 +294,13 @@ def insert_reading_level_anomalies(db: Session, anomalies_df: pd.DataFrame) -> N
         logger.info("No anomalies to insert.")
         return
 
-    records = anomalies_df.to_dict(orient='records')
-    stmt = sqlite_insert(DailyAnomaly).values(records)
+    stmt = sqlite_insert(DailyAnomaly.__table__)
     stmt = stmt.on_conflict_do_nothing(index_elements=['date', 'turbine_id'])
 
     try:
-        result = db.execute(stmt)
-        logger.info(f"Inserted {result.rowcount or 0} anomaly records.")
-    except SQLAlchemyError:
+        rowcount = _executemany(db, stmt, anomalies_df)
+        logger.info(f"Inserted {rowcount} anomaly records.")
+    except (SQLAlchemyError, sqlite3.Error):
         logger.exception("Failed to insert daily anomalies")
         db.rollback()
         raise
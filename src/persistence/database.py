@@ -1,8 +1,8 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.orm import sessionmaker, declarative_base
 from contextlib import contextmanager
 
-from config.constants import DATABASE_URL
+from config.constants import DATABASE_URL, SQLITE_PRAGMAS
 
 # Create the engine
 engine = create_engine(
@@ -10,6 +10,18 @@ engine = create_engine(
     connect_args={"check_same_thread": False}  # Needed only for SQLite
 )
 
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLITE_PRAGMAS to every new DBAPI connection."""
+    if engine.dialect.name != "sqlite":
+        return
+    cursor = dbapi_connection.cursor()
+    for pragma, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {pragma}={value}")
+    cursor.close()
+
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -18,11 +30,31 @@ Base = declarative_base()
 
 
 def create_database():
-    """Create the database tables if they do not exist."""
+    """Create the database tables (and indexes added since) if they do not exist."""
     Base.metadata.create_all(bind=engine)
+    # create_all skips columns and indexes added to tables that already exist
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {col["name"] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    col_type = column.type.compile(dialect=engine.dialect)
+                    conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}")
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
     print("Tables created successfully (if they didn't already exist).")
 
 
+def analyze_database():
+    """Refresh the query planner statistics after a load so SQLite picks up the indexes."""
+    with engine.connect() as conn:
+        # Bounded, approximate ANALYZE: cost does not grow with the table size
+        conn.exec_driver_sql("PRAGMA analysis_limit=1000")
+        conn.exec_driver_sql("ANALYZE")
+        conn.commit()
+
+
 @contextmanager
 def get_db_session():
     """Provide a transactional scope around a series of operations."""
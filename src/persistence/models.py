@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, Boolean, DateTime, UniqueConstraint, String
+from sqlalchemy import Column, Integer, Float, Boolean, DateTime, UniqueConstraint, String, Index
 from persistence.database import Base
 
 
@@ -14,6 +14,8 @@ class TurbineReading(Base):
 
     __table_args__ = (
         UniqueConstraint('timestamp', 'turbine_id', name='unique_timestamp_turbine'),
+        # Covering index for the per-turbine daily totals over a time window
+        Index('ix_reading_turbine_ts', 'turbine_id', 'timestamp', 'power_output'),
     )
 
 
@@ -24,6 +26,8 @@ class DailySummary(Base):
     min_power_output = Column(Float, nullable=False)
     max_power_output = Column(Float, nullable=False)
     mean_power_output = Column(Float, nullable=False)
+    # Nullable: rows written before this column existed have no total
+    total_power_output = Column(Float)
 
 
 class DailyAnomaly(Base):
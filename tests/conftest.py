@@ -0,0 +1,22 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+
+@pytest.fixture
+def make_readings():
+    """Factory for 5-minute readings starting 2025-04-01, one block per turbine."""
+    def _make(days=5, turbines=(1, 2), seed=0, dtype="float64"):
+        rng = np.random.default_rng(seed)
+        timestamps = pd.date_range("2025-04-01", periods=days * 288, freq="5min")
+        return pd.concat([
+            pd.DataFrame({
+                "timestamp": timestamps,
+                "turbine_id": turbine_id,
+                "wind_speed": rng.uniform(0, 25, len(timestamps)).astype(dtype),
+                "wind_direction": rng.uniform(0, 360, len(timestamps)).astype(dtype),
+                "power_output": rng.normal(3, 1, len(timestamps)).astype(dtype),
+            })
+            for turbine_id in turbines
+        ], ignore_index=True)
+    return _make
@@ -1,22 +1,27 @@
 import pytest
+import numpy as np
 import pandas as pd
+from config.constants import OUTLIER_STD_THRESHOLD
+from ingestion import cleaning
 from ingestion.cleaning import remove_duplicates, handle_missing_values, clean_physical_limits, \
-    detect_and_handle_outliers_statistically_std, clean_data
+    detect_and_handle_outliers_statistically_std, detect_and_handle_outliers_statistically_IQR, clean_data, \
+    fused_clean
 
 # Sample data for testing
 sample_data = {
-    "timestamp": pd.date_range("2025-04-01", periods=6, freq="5T"),
+    "timestamp": pd.date_range("2025-04-01", periods=6, freq="5min"),
     "turbine_id": [1, 1, 1, 2, 2, 2],
     "wind_speed": [10, 15, 12, 5, 0, 8],
     "power_output": [100, 150, 120, 50, 0, 70],
     "wind_direction": [90, 90, 90, 180, 180, 180],
 }
+_SAMPLE_DF = pd.DataFrame(sample_data)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_dataframe():
-    """Fixture to provide a simple DataFrame for testing."""
-    return pd.DataFrame(sample_data)
+    """Fixture to provide a simple DataFrame for testing. Shared by all tests: copy before mutating."""
+    return _SAMPLE_DF
 
 
 def test_remove_duplicates(sample_dataframe):
@@ -40,6 +45,17 @@ def test_handle_missing_values(sample_dataframe):
     assert not df_cleaned["power_output"].isnull().any(), "Missing power_output values not handled properly."
 
 
+def test_handle_missing_values_leaves_input_unchanged(sample_dataframe):
+    # Already sorted with no critical values missing, so nothing forces a copy before the fill
+    df_with_missing_values = sample_dataframe.copy()
+    df_with_missing_values.loc[2, "wind_speed"] = None
+    df_before = df_with_missing_values.copy()
+
+    handle_missing_values(df_with_missing_values)
+
+    pd.testing.assert_frame_equal(df_with_missing_values, df_before)
+
+
 def test_clean_physical_limits(sample_dataframe):
     # Set physical limits for wind_speed
     sensor_limits = {"wind_speed": {"min": 5, "max": 20}}
@@ -54,6 +70,24 @@ def test_clean_physical_limits(sample_dataframe):
     assert len(df_cleaned) == len(sample_dataframe) - 2, "Rows outside physical limits not removed correctly."
 
 
+def test_detect_and_handle_outliers():
+    # One turbine with a single extreme reading, one turbine with steady output
+    df = pd.DataFrame({
+        "timestamp": list(pd.date_range("2025-04-01", periods=20, freq="5min")) * 2,
+        "turbine_id": [1] * 20 + [2] * 20,
+        "power_output": [100.0] * 19 + [1000.0] + [50.0, 51.0] * 10,
+    })
+
+    for detect in (detect_and_handle_outliers_statistically_std, detect_and_handle_outliers_statistically_IQR):
+        df_dropped = detect(df, action="drop")
+        assert len(df_dropped) == len(df) - 1, f"{detect.__name__} did not drop the outlier."
+        assert df_dropped["power_output"].max() == 100.0
+
+        df_flagged = detect(df, action="flag")
+        assert len(df_flagged) == len(df)
+        assert df_flagged["is_outlier"].tolist() == [False] * 19 + [True] + [False] * 20
+
+
 def test_clean_data(sample_dataframe):
     # Set physical limits for wind_speed
     sensor_limits = {"wind_speed": {"min": 5, "max": 20}}
@@ -72,3 +106,41 @@ def test_clean_data(sample_dataframe):
     assert not df_cleaned["wind_speed"].isnull().any(), "Missing wind_speed values not handled properly."
     assert not df_cleaned["power_output"].isnull().any(), "Missing power_output values not handled properly."
     assert len(df_cleaned) == len(sample_dataframe) - 2, "Rows outside physical limits not removed correctly."
+
+
+def test_fused_clean_matches_sequential_steps():
+    # Unsorted readings with duplicates, sensor gaps, physically invalid values and outliers
+    rng = np.random.default_rng(0)
+    n = 400
+    df = pd.DataFrame({
+        "timestamp": pd.Timestamp("2025-04-01") + pd.to_timedelta(rng.integers(0, 100, n) * 5, unit="min"),
+        "turbine_id": rng.integers(1, 5, n),
+        "wind_speed": rng.uniform(-1, 25, n),
+        "power_output": rng.normal(100, 10, n),
+        "wind_direction": rng.uniform(0, 370, n),
+    })
+    df.loc[rng.choice(n, 40, replace=False), "wind_speed"] = np.nan
+    df.loc[rng.choice(n, 10, replace=False), "power_output"] = 1000.0
+
+    expected = detect_and_handle_outliers_statistically_std(
+        clean_physical_limits(handle_missing_values(remove_duplicates(df))))
+    df_cleaned = fused_clean(df)
+
+    pd.testing.assert_frame_equal(df_cleaned, expected.reset_index(drop=True))
+
+
+def test_std_outlier_mask_numpy_fallback_matches_pandas(monkeypatch):
+    monkeypatch.setattr(cleaning, "outlier_mask", None)
+    rng = np.random.default_rng(1)
+    turbine_ids = rng.integers(1, 5, 500)
+    turbine_ids[-1] = 9  # single reading: NaN std, flagged like Series.between does
+    values = rng.normal(100, 20, 500).astype("float32")
+    values[::13] = np.nan
+    values[::97] = 1000.0
+
+    s = pd.Series(values, dtype="float64")
+    grouped = s.groupby(turbine_ids)
+    mean, std = grouped.transform("mean"), grouped.transform("std")
+    expected = ~s.between(mean - OUTLIER_STD_THRESHOLD * std, mean + OUTLIER_STD_THRESHOLD * std)
+
+    np.testing.assert_array_equal(cleaning._std_outlier_mask(values, turbine_ids), expected.to_numpy())
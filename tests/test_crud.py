@@ -0,0 +1,209 @@
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import date
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from analysis.statistics import calculate_daily_summary
+from persistence import _stats_cache
+from persistence.database import Base
+from persistence.models import TurbineReading
+from persistence.crud import (
+    insert_or_update_readings_from_dataframe,
+    insert_daily_summary,
+    load_historical_daily_totals_stats,
+    load_historical_daily_avg_stats,
+)
+
+
+@pytest.fixture
+def db():
+    """In-memory SQLite session; StaticPool so pd.read_sql on db.bind sees the same database."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    _stats_cache.clear()
+    with Session(engine) as session:
+        yield session
+    _stats_cache.clear()
+
+
+def reference_daily_totals(df):
+    return df.groupby(["turbine_id", df["timestamp"].dt.date])["power_output"].sum()
+
+
+def reference_totals_stats(df, before_date):
+    totals = reference_daily_totals(df).reset_index(level=0)
+    totals = totals[totals.index < before_date]
+    return totals.groupby("turbine_id")["power_output"].agg(["mean", "std"])
+
+
+@pytest.mark.parametrize("window_days", [None, 7])
+def test_daily_totals_stats_fall_back_to_readings_per_day(db, window_days, make_readings):
+    df = make_readings()
+    insert_or_update_readings_from_dataframe(db, df)
+    # Summaries for the first three days only, one of them written before total_power_output existed
+    summary_df = calculate_daily_summary(df)
+    insert_daily_summary(db, summary_df[summary_df["date"] < pd.Timestamp("2025-04-04")])
+    db.execute(text("UPDATE daily_summary SET total_power_output = NULL "
+                    "WHERE date LIKE '2025-04-02%' AND turbine_id = 1"))
+    db.commit()
+
+    before_date = date(2025, 4, 6)
+    stats = load_historical_daily_totals_stats(db, before_date, window_days).set_index("turbine_id")
+    expected = reference_totals_stats(df, before_date)
+
+    np.testing.assert_allclose(stats["hist_mean_daily_output"], expected["mean"])
+    np.testing.assert_allclose(stats["hist_std_daily_output"], expected["std"])
+
+
+def test_daily_summary_recomputed_on_conflict(db, make_readings):
+    df = make_readings(days=1)
+    first_half = df[df["timestamp"] < pd.Timestamp("2025-04-01 12:00")]
+    second_half = df[df["timestamp"] >= pd.Timestamp("2025-04-01 12:00")]
+
+    # The same day arrives in two files; the second summary conflicts with the first
+    for part in (first_half, second_half):
+        insert_or_update_readings_from_dataframe(db, part)
+        insert_daily_summary(db, calculate_daily_summary(part))
+    db.commit()
+
+    stored = pd.read_sql("SELECT turbine_id, min_power_output, max_power_output, mean_power_output, "
+                         "total_power_output FROM daily_summary ORDER BY turbine_id", db.bind)
+    expected = df.groupby("turbine_id")["power_output"].agg(["min", "max", "mean", "sum"])
+    assert stored["turbine_id"].tolist() == expected.index.tolist()
+    for col, agg in [("min_power_output", "min"), ("max_power_output", "max"),
+                     ("mean_power_output", "mean"), ("total_power_output", "sum")]:
+        np.testing.assert_allclose(stored[col], expected[agg], err_msg=f"{col} not recomputed on conflict.")
+
+
+def test_bulk_insert_writes_orm_timestamp_format(db, make_readings):
+    # Microseconds included, so the fractional part of the format is exercised too
+    df = make_readings(days=1).iloc[[0, 1]].copy()
+    df["timestamp"] = pd.to_datetime(["2025-04-01 00:00:00", "2025-04-01 00:05:00.250000"], format="ISO8601")
+    insert_or_update_readings_from_dataframe(db, df)
+
+    db.add(TurbineReading(timestamp=df["timestamp"].iloc[1].to_pydatetime(), turbine_id=9,
+                          wind_speed=1.0, wind_direction=1.0, power_output=1.0))
+    db.flush()
+
+    rows = db.execute(text("SELECT turbine_id, timestamp FROM turbine_readings ORDER BY id")).fetchall()
+    assert rows == [(1, "2025-04-01 00:00:00.000000"),
+                    (1, "2025-04-01 00:05:00.250000"),
+                    (9, "2025-04-01 00:05:00.250000")], "Bulk insert text differs from the ORM's."
+
+    # And the ORM reads the bulk-inserted rows back as the original datetimes
+    stored = [r.timestamp for r in db.query(TurbineReading).filter(TurbineReading.turbine_id == 1)
+              .order_by(TurbineReading.timestamp)]
+    assert stored == [ts.to_pydatetime() for ts in df["timestamp"]]
+
+
+@pytest.mark.parametrize("window_days", [None, 3])
+def test_daily_avg_stats_match_pandas(db, window_days, make_readings):
+    df = make_readings(days=5, turbines=(1, 2, 3))
+    df = df[(df["turbine_id"] != 3) | (df["timestamp"] < pd.Timestamp("2025-04-02"))]  # one day: NaN std
+    summary_df = calculate_daily_summary(df)
+    insert_daily_summary(db, summary_df)
+    db.commit()
+
+    before_date = date(2025, 4, 5)
+    stats = load_historical_daily_avg_stats(db, before_date, window_days).set_index("turbine_id")
+
+    history = summary_df[summary_df["date"] < pd.Timestamp(before_date)]
+    if window_days is not None:
+        history = history[history["date"] >= pd.Timestamp(before_date) - pd.Timedelta(days=window_days)]
+    expected = history.groupby("turbine_id")["mean_power_output"].agg(["mean", "std"])
+
+    assert stats.index.tolist() == expected.index.tolist()
+    np.testing.assert_allclose(stats["hist_mean_power_output"], expected["mean"])
+    np.testing.assert_allclose(stats["hist_std_power_output"], expected["std"], equal_nan=True)
+
+
+def test_inserts_invalidate_stats_cache(db, make_readings):
+    df = make_readings(days=3)
+    insert_or_update_readings_from_dataframe(db, df)
+    db.commit()
+
+    before_date = date(2025, 4, 4)
+    first = load_historical_daily_totals_stats(db, before_date, window_days=3)
+    days = [date(2025, 4, 1), date(2025, 4, 2), date(2025, 4, 3)]
+    assert _stats_cache.missing_days(db.get_bind(), days) == []
+
+    # Rewrite one day's readings: the cached totals for that day must be dropped
+    changed = df[df["timestamp"].dt.date == date(2025, 4, 2)].assign(power_output=10.0)
+    insert_or_update_readings_from_dataframe(db, changed, update_existing=True)
+    db.commit()
+    assert _stats_cache.missing_days(db.get_bind(), days) == [date(2025, 4, 2)]
+
+    second = load_historical_daily_totals_stats(db, before_date, window_days=3).set_index("turbine_id")
+    expected = reference_totals_stats(pd.concat([df[df["timestamp"].dt.date != date(2025, 4, 2)], changed]),
+                                      before_date)
+    np.testing.assert_allclose(second["hist_mean_daily_output"], expected["mean"])
+    assert not np.allclose(second["hist_mean_daily_output"], first["hist_mean_daily_output"])
+
+    # The reload re-cached 2025-04-02; summary inserts invalidate the same way
+    assert _stats_cache.missing_days(db.get_bind(), days) == []
+    insert_daily_summary(db, calculate_daily_summary(df[df["timestamp"].dt.date == date(2025, 4, 3)]))
+    assert _stats_cache.missing_days(db.get_bind(), days) == [date(2025, 4, 3)]
+
+
+@pytest.mark.parametrize("window_days", [None, 7])
+def test_daily_totals_stats_without_history(db, window_days):
+    stats = load_historical_daily_totals_stats(db, date(2025, 4, 6), window_days)
+    assert stats.empty
+    assert list(stats.columns) == ["turbine_id", "hist_mean_daily_output", "hist_std_daily_output"]
+
+
+def test_float32_readings_stored_as_parsed(db, make_readings):
+    df = make_readings(days=1, dtype="float32").round(3)  # rounding keeps float32
+    insert_or_update_readings_from_dataframe(db, df)
+    insert_daily_summary(db, calculate_daily_summary(df))
+    db.commit()
+
+    # The values a float64 parse of the same CSV text gives, not the widened float32 ones
+    expected = df[["wind_speed", "wind_direction", "power_output"]].astype(str).astype("float64")
+    stored = pd.read_sql("SELECT wind_speed, wind_direction, power_output FROM turbine_readings "
+                         "ORDER BY turbine_id, timestamp", db.bind)
+    pd.testing.assert_frame_equal(stored, expected.reset_index(drop=True))
+
+    summary = pd.read_sql("SELECT turbine_id, min_power_output, max_power_output FROM daily_summary "
+                          "ORDER BY turbine_id", db.bind)
+    by_turbine = expected["power_output"].groupby(df["turbine_id"])
+    assert summary["min_power_output"].tolist() == by_turbine.min().tolist()
+    assert summary["max_power_output"].tolist() == by_turbine.max().tolist()
+
+
+def test_stats_cache_is_per_database(db, make_readings):
+    other_engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(other_engine)
+    before_date = date(2025, 4, 4)
+    df = make_readings(days=3)
+    insert_or_update_readings_from_dataframe(db, df)
+    db.commit()
+
+    with Session(other_engine) as other:
+        insert_or_update_readings_from_dataframe(other, df.assign(power_output=10.0))
+        other.commit()
+        other_stats = load_historical_daily_totals_stats(other, before_date, window_days=3)
+        stats = load_historical_daily_totals_stats(db, before_date, window_days=3)
+
+    # 288 readings of 10.0 per day, not the first database's totals
+    np.testing.assert_allclose(other_stats["hist_mean_daily_output"], 2880.0)
+    np.testing.assert_allclose(stats.set_index("turbine_id")["hist_mean_daily_output"],
+                               reference_totals_stats(df, before_date)["mean"])
+
+
+def test_stats_cache_is_bounded(db, make_readings, monkeypatch):
+    monkeypatch.setattr(_stats_cache, "MAX_DAYS", 4)
+    df = make_readings(days=6)
+    insert_or_update_readings_from_dataframe(db, df)
+    db.commit()
+
+    # A window larger than the cache still sees every day
+    stats = load_historical_daily_totals_stats(db, date(2025, 4, 7), window_days=6).set_index("turbine_id")
+    np.testing.assert_allclose(stats["hist_mean_daily_output"],
+                               reference_totals_stats(df, date(2025, 4, 7))["mean"])
+
+    days = [date(2025, 4, d) for d in range(1, 7)]
+    assert _stats_cache.missing_days(db.get_bind(), days) == days[:2], "Oldest days not evicted first."
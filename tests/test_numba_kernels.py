@@ -0,0 +1,86 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+pytest.importorskip("numba")
+
+from ingestion._numba_kernels import mark_out_of_range, outlier_mask  # noqa: E402
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+@pytest.mark.parametrize("lo, hi", [(0.0, 100.0), (0.1, 99.9), (-np.inf, 360.0), (0.0, np.inf)])
+def test_mark_out_of_range_matches_numpy(dtype, lo, hi):
+    rng = np.random.default_rng(0)
+    values = rng.normal(50, 60, 1000).astype(dtype)
+    values[::7] = np.nan
+    values[1], values[2] = lo, hi  # exactly on the limits: kept
+
+    out = np.zeros(len(values), dtype=bool)
+    mark_out_of_range(values, lo, hi, out)
+
+    np.testing.assert_array_equal(out, (values < lo) | (values > hi))
+    assert not out[1] and not out[2], "Values on the limits flagged as out of range."
+    assert not out[::7].any(), "NaN values flagged as out of range."
+
+
+def test_mark_out_of_range_keeps_existing_flags():
+    out = np.array([True, False, False])
+    mark_out_of_range(np.array([5.0, 5.0, 50.0]), 0.0, 10.0, out)
+    np.testing.assert_array_equal(out, [True, False, True])
+
+
+def pandas_outlier_mask(values, turbine_ids, thr):
+    s = pd.Series(values, dtype="float64")
+    grouped = s.groupby(turbine_ids)
+    mean, std = grouped.transform("mean"), grouped.transform("std")
+    return ~s.between(mean - thr * std, mean + thr * std).to_numpy()
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+def test_outlier_mask_matches_pandas(shuffle):
+    rng = np.random.default_rng(1)
+    turbine_ids = np.repeat(np.arange(1, 6), 200)
+    values = rng.normal(100, 20, len(turbine_ids))
+    values[::11] = np.nan
+    values[::97] = 1000.0
+    if shuffle:
+        order = rng.permutation(len(values))
+        turbine_ids, values = turbine_ids[order], values[order]
+
+    np.testing.assert_array_equal(outlier_mask(values, turbine_ids, 3.0),
+                                  pandas_outlier_mask(values, turbine_ids, 3.0))
+
+
+def test_outlier_mask_edge_cases():
+    # Turbine 1: mean 1, std 1, so with thr=1 the values 0 and 2 sit exactly on the bounds.
+    # Turbine 2 has a single reading (NaN std) and turbine 3 only a NaN: both are flagged, like pandas.
+    values = np.array([0.0, 1.0, 2.0, 5.0, np.nan])
+    turbine_ids = np.array([1, 1, 1, 2, 3])
+
+    mask = outlier_mask(values, turbine_ids, 1.0)
+
+    np.testing.assert_array_equal(mask, pandas_outlier_mask(values, turbine_ids, 1.0))
+    np.testing.assert_array_equal(mask, [False, False, False, True, True])
+
+
+def test_clean_physical_limits_kernel_matches_numpy(monkeypatch):
+    from config.constants import SENSOR_LIMITS
+    from ingestion import cleaning
+
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({
+        "turbine_id": np.repeat([1, 2], 100),
+        "wind_speed": rng.uniform(-5, 40, 200).astype("float32"),
+        "wind_direction": rng.uniform(-10, 370, 200).astype("float32"),
+        "power_output": rng.normal(3, 2, 200).astype("float32"),
+    })
+    df.loc[::9, "wind_speed"] = np.nan
+
+    calls = []
+    monkeypatch.setattr(cleaning, "mark_out_of_range",
+                        lambda *args: calls.append(args[1:3]) or mark_out_of_range(*args))
+    with_kernel = cleaning.clean_physical_limits(df, SENSOR_LIMITS)
+    assert len(calls) == len(SENSOR_LIMITS), "clean_physical_limits did not use the kernel."
+
+    monkeypatch.setattr(cleaning, "mark_out_of_range", None)
+    pd.testing.assert_frame_equal(with_kernel, cleaning.clean_physical_limits(df, SENSOR_LIMITS))
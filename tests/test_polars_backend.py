@@ -0,0 +1,37 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+pytest.importorskip("polars")
+
+from ingestion.cleaning import clean_data  # noqa: E402
+from ingestion.polars_backend import clean_and_summarise  # noqa: E402
+from analysis.statistics import calculate_daily_summary  # noqa: E402
+
+
+def dirty_readings(make_readings, seed=0):
+    df = make_readings(days=2, turbines=(1, 2, 3), seed=seed, dtype="float32")
+    rng = np.random.default_rng(seed)
+    df.loc[rng.random(len(df)) < 0.05, "wind_speed"] = np.nan  # gaps for the forward-fill
+    df.loc[rng.random(len(df)) < 0.01, "wind_direction"] = 400.0  # outside physical limits
+    df.loc[rng.random(len(df)) < 0.01, "power_output"] = 50.0  # statistical outliers
+    return pd.concat([df, df.iloc[:10]], ignore_index=True)  # duplicates
+
+
+def test_polars_backend_matches_pandas(make_readings):
+    df = dirty_readings(make_readings)
+
+    cleaned, summary = clean_and_summarise(df.copy())
+    expected_cleaned = clean_data(df.copy())
+    expected_summary = calculate_daily_summary(expected_cleaned)
+
+    assert len(cleaned) == len(expected_cleaned)
+    np.testing.assert_array_equal(cleaned["timestamp"].to_numpy().astype("datetime64[ns]"),
+                                  expected_cleaned["timestamp"].to_numpy())
+    for col in ["turbine_id", "wind_speed", "wind_direction", "power_output"]:
+        np.testing.assert_array_equal(cleaned[col].to_numpy(), expected_cleaned[col].to_numpy())
+
+    np.testing.assert_array_equal(summary["date"].to_numpy().astype("datetime64[ns]"),
+                                  expected_summary["date"].to_numpy().astype("datetime64[ns]"))
+    for col in ["turbine_id", "min_power_output", "max_power_output", "mean_power_output", "total_power_output"]:
+        np.testing.assert_allclose(summary[col].to_numpy(), expected_summary[col].to_numpy(), rtol=1e-9)
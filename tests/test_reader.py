@@ -0,0 +1,118 @@
+import pytest
+import numpy as np
+import pandas as pd
+from ingestion import reader
+from ingestion.reader import read_and_validate_csv, read_csv_file
+
+CSV_HEADER = "timestamp,turbine_id,wind_speed,wind_direction,power_output\n"
+
+
+def write_csv(tmp_path, turbine_ids, name="data_group_1.csv"):
+    path = tmp_path / name
+    rows = [f"2025-04-01 00:{5 * i:02d}:00,{tid},10.0,90.0,100.0\n" for i, tid in enumerate(turbine_ids)]
+    path.write_text(CSV_HEADER + "".join(rows))
+    return str(path)
+
+
+@pytest.mark.parametrize("bad_id", [-1, 65537, 70000])
+@pytest.mark.parametrize("chunksize", [None, 1])
+def test_compact_rejects_out_of_range_turbine_ids(tmp_path, bad_id, chunksize):
+    # 65537 would wrap to 1 in uint16 and pass the group-1 range check
+    path = write_csv(tmp_path, [1, 2, bad_id])
+    assert read_and_validate_csv(path, "data_group_1", chunksize=chunksize, compact=True) is None, \
+        "Out-of-range turbine ID accepted with compact=True."
+    assert read_csv_file(path, chunksize=chunksize, compact=True) is None
+
+
+def test_compact_downcasts_valid_turbine_ids(tmp_path):
+    path = write_csv(tmp_path, [1, 2, 3, 4, 5])
+    df = read_and_validate_csv(path, "data_group_1", compact=True)
+    assert df["turbine_id"].dtype == "uint16"
+    assert df["turbine_id"].tolist() == [1, 2, 3, 4, 5]
+
+
+def test_missing_column_is_rejected(tmp_path):
+    path = tmp_path / "data_group_1.csv"
+    path.write_text("timestamp,turbine_id,wind_speed,power_output\n2025-04-01 00:00:00,1,10.0,100.0\n")
+    assert read_csv_file(str(path)) is None
+    assert read_csv_file(str(path), chunksize=1) is None
+
+
+@pytest.mark.parametrize("chunksize", [None, 1])
+def test_unconvertible_values_are_rejected(tmp_path, chunksize):
+    path = write_csv(tmp_path, [1, 99999999999999999999])  # does not fit in int64
+    assert read_csv_file(path, chunksize=chunksize) is None
+    assert read_and_validate_csv(path, "data_group_1", chunksize=chunksize) is None
+
+    path = tmp_path / "text.csv"
+    path.write_text(CSV_HEADER + "2025-04-01 00:00:00,1,fast,90.0,100.0\n")
+    assert read_csv_file(str(path), chunksize=chunksize) is None
+
+
+def test_directory_path_is_rejected(tmp_path):
+    assert read_csv_file(str(tmp_path)) is None
+    assert read_csv_file(str(tmp_path), chunksize=1) is None
+
+
+@pytest.mark.parametrize("chunksize", [None, 1])
+def test_decoding_errors_propagate(tmp_path, chunksize):
+    path = tmp_path / "data_group_1.csv"
+    path.write_bytes(CSV_HEADER.encode() + b"2025-04-01 00:00:00,1,\xff\xfe,90.0,100.0\n")
+    with pytest.raises(UnicodeDecodeError):
+        read_csv_file(str(path), chunksize=chunksize)
+
+
+def test_cache_returns_independent_copies(tmp_path):
+    path = write_csv(tmp_path, [1, 2, 3, 4, 5])
+    df = read_and_validate_csv(path, "data_group_1", cache=True)
+    df.loc[df.index[0], "power_output"] = -1.0  # in-place edit by the caller
+
+    again = read_and_validate_csv(path, "data_group_1", cache=True)
+    assert again is not df
+    assert (again["power_output"] == 100.0).all(), "Caller's edit leaked into the cached frame."
+
+
+def test_cache_rereads_rewritten_file(tmp_path):
+    path = write_csv(tmp_path, [1, 2, 3, 4, 5])
+    assert len(read_and_validate_csv(path, "data_group_1", cache=True)) == 5
+
+    write_csv(tmp_path, [1, 2, 3, 4, 5, 1])
+    assert len(read_and_validate_csv(path, "data_group_1", cache=True)) == 6
+
+
+def test_pyarrow_backend_matches_default(tmp_path):
+    pytest.importorskip("pyarrow")
+    # Unsorted, with a missing value, so sorting and validation both have work to do
+    path = tmp_path / "data_group_1.csv"
+    path.write_text(CSV_HEADER
+                    + "2025-04-01 00:05:00,2,11.0,90.0,110.0\n"
+                    + "2025-04-01 00:00:00,2,10.0,90.0,100.0\n"
+                    + "2025-04-01 00:05:00,1,,91.0,120.0\n"
+                    + "2025-04-01 00:00:00,1,12.5,92.0,130.0\n")
+
+    default = read_and_validate_csv(str(path), "data_group_1")
+    arrow = read_and_validate_csv(str(path), "data_group_1", backend="pyarrow")
+
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in arrow.dtypes)
+    assert arrow.index.tolist() == default.index.tolist(), "Arrow-backed frame sorted differently."
+    np.testing.assert_array_equal(arrow["timestamp"].to_numpy().astype("datetime64[ns]"),
+                                  default["timestamp"].to_numpy())
+    for col in ["turbine_id", "wind_speed", "wind_direction", "power_output"]:
+        np.testing.assert_array_equal(arrow[col].to_numpy(dtype=default[col].dtype, na_value=np.nan),
+                                      default[col].to_numpy())
+
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+@pytest.mark.parametrize("suffix", ["", "Z"])
+def test_timestamp_dtype_does_not_depend_on_engine(tmp_path, monkeypatch, engine, suffix):
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(reader, "CSV_ENGINE", engine)
+    path = tmp_path / "data_group_1.csv"
+    path.write_text(CSV_HEADER + f"2025-04-01T00:05:00{suffix},1,10.0,90.0,100.0\n"
+                    + f"2025-04-01T23:55:00{suffix},2,10.0,90.0,100.0\n")
+
+    for chunksize in (None, 1):
+        df = read_and_validate_csv(str(path), "data_group_1", chunksize=chunksize)
+        assert df["timestamp"].dtype == "datetime64[ns]", f"Got {df['timestamp'].dtype} with {engine}."
+        assert df["timestamp"].tolist() == [pd.Timestamp("2025-04-01 00:05"), pd.Timestamp("2025-04-01 23:55")]
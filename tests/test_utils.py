@@ -0,0 +1,28 @@
+import pandas as pd
+from datetime import date
+from ingestion.reader import read_and_validate_csv
+from ingestion.utils import filter_today_data
+
+
+def test_filter_today_data_with_utc_timestamps(tmp_path):
+    path = tmp_path / "data_group_1.csv"
+    path.write_text("timestamp,turbine_id,wind_speed,wind_direction,power_output\n"
+                    "2025-04-01T23:55:00Z,1,10.0,90.0,100.0\n"
+                    "2025-04-02T00:00:00Z,1,10.0,90.0,110.0\n"
+                    "2025-04-02T23:55:00Z,2,10.0,90.0,120.0\n"
+                    "2025-04-03T00:00:00Z,2,10.0,90.0,130.0\n")
+    df = read_and_validate_csv(str(path), "data_group_1")
+
+    today = filter_today_data(df, date(2025, 4, 2))
+
+    assert today["power_output"].tolist() == [110.0, 120.0]
+    assert (today["timestamp"].dt.date == date(2025, 4, 2)).all()
+
+
+def test_filter_today_data_unsorted_matches_date_filter():
+    df = pd.DataFrame({
+        "timestamp": pd.to_datetime(["2025-04-02 00:05", "2025-04-01 23:55", "2025-04-02 00:00", "2025-04-03 00:00"]),
+        "turbine_id": [2, 1, 1, 1],
+    })
+    expected = df[df["timestamp"].dt.date == date(2025, 4, 2)]
+    pd.testing.assert_frame_equal(filter_today_data(df, date(2025, 4, 2)), expected)